@@ -3,12 +3,15 @@ Continuous Learning - Непрерывное обучение в фоновом
 """
 import logging
 import threading
-import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from ai_learning.self_learning import SelfLearningEngine
 
 logger = logging.getLogger(__name__)
 
+# Пауза перед повтором, если плановое обучение не удалось
+RETRY_SECONDS = 3600
+
 class ContinuousLearner:
     """
     Непрерывное обучение в фоновом режиме
@@ -39,8 +42,20 @@ class ContinuousLearner:
         self.queries_since_training = 0
         self.is_running = False
         self.thread = None
+        self._stop_event = threading.Event()
+        self._counter_lock = threading.Lock()
+        # Обучение по счётчику идёт в отдельном потоке, вызывающий не ждёт;
+        # _train_lock не даёт двум обучениям (по запросам и по времени) идти разом
+        self._train_lock = threading.Lock()
+        self._train_pending = False
+        self._executor = self._new_executor()
+        self._executor_closed = False
         self.engine = SelfLearningEngine(min_samples=min_samples)
     
+    @staticmethod
+    def _new_executor() -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(max_workers=1, thread_name_prefix="continuous-learning")
+    
     def start(self):
         """Запуск фонового обучения"""
         if self.is_running:
@@ -48,6 +63,11 @@ class ContinuousLearner:
             return
         
         self.is_running = True
+        self._stop_event.clear()
+        if self._executor_closed:
+            # executor закрыт в stop() -- нужен новый
+            self._executor = self._new_executor()
+            self._executor_closed = False
         self.thread = threading.Thread(target=self._learning_loop, daemon=True)
         self.thread.start()
         logger.info("✅ Continuous learning запущен")
@@ -55,36 +75,76 @@ class ContinuousLearner:
     def stop(self):
         """Остановка фонового обучения"""
         self.is_running = False
+        self._stop_event.set()  # будит поток, не дожидаясь конца ожидания
         if self.thread:
             self.thread.join(timeout=5)
+        # Поставленное в очередь обучение отменяется; идущее дорабатывает само,
+        # но новых запусков executor уже не примет
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor_closed = True
+        with self._counter_lock:
+            self._train_pending = False
         logger.info("⏹️ Continuous learning остановлен")
     
     def notify_new_query(self):
         """Уведомление о новом запросе"""
-        self.queries_since_training += 1
+        with self._counter_lock:
+            self.queries_since_training += 1
+            queries = self.queries_since_training
+            
+            # Проверяем, пора ли обучаться (глубокое обучение)
+            should_train = queries >= self.queries_threshold and not self._train_pending
+            if should_train:
+                self._train_pending = True
         
-        # Проверяем, пора ли обучаться (глубокое обучение)
-        if self.queries_since_training >= self.queries_threshold:
-            logger.info(f"🧠🔄 Накоплено {self.queries_since_training} запросов. Запуск ГЛУБОКОГО обучения...")
-            self._train()
+        if should_train:
+            logger.info(f"🧠🔄 Накоплено {queries} запросов. Запуск ГЛУБОКОГО обучения...")
+            try:
+                self._executor.submit(self._train_from_queries)
+            except RuntimeError:  # executor закрыт: learner остановлен
+                with self._counter_lock:
+                    self._train_pending = False
     
     def _learning_loop(self):
-        """Цикл фонового обучения"""
-        while self.is_running:
+        """Цикл фонового обучения: спим ровно до следующего планового запуска"""
+        interval = timedelta(hours=self.hours_interval)
+        while not self._stop_event.is_set():
+            next_train = self.last_training_time + interval
+            sleep_s = max(0.0, (next_train - datetime.now()).total_seconds())
+            if self._stop_event.wait(sleep_s):
+                break
+            
+            # Обучение по счётчику запросов могло сдвинуть срок
+            if datetime.now() - self.last_training_time < interval:
+                continue
+            
             try:
-                # Проверяем временной интервал
-                time_since_training = datetime.now() - self.last_training_time
-                
-                if time_since_training >= timedelta(hours=self.hours_interval):
-                    logger.info(f"⏰ Прошло {self.hours_interval} часов. Запуск обучения...")
-                    self._train()
-                
-                # Спим 1 час
-                time.sleep(3600)
-                
+                logger.info(f"⏰ Прошло {self.hours_interval} часов. Запуск обучения...")
+                self._train_guarded()
             except Exception as e:
                 logger.error(f"Ошибка в цикле обучения: {e}")
-                time.sleep(3600)
+            
+            # Обучение не удалось (время не обновилось) — повтор не раньше чем через час
+            if datetime.now() - self.last_training_time >= interval:
+                self._stop_event.wait(RETRY_SECONDS)
+    
+    def _train_from_queries(self):
+        """Обучение по счётчику запросов (в потоке executor)"""
+        try:
+            self._train_guarded()
+        finally:
+            with self._counter_lock:
+                self._train_pending = False
+    
+    def _train_guarded(self):
+        """_train(), если обучение уже не идёт в другом потоке"""
+        if not self._train_lock.acquire(blocking=False):
+            logger.info("Обучение уже выполняется, повторный запуск пропущен")
+            return
+        try:
+            self._train()
+        finally:
+            self._train_lock.release()
     
     def _train(self):
         """Запуск глубокого обучения"""
@@ -96,7 +156,8 @@ class ContinuousLearner:
                        f"примеров={report['few_shot_created']}")
             
             # Сбрасываем счетчики
-            self.queries_since_training = 0
+            with self._counter_lock:
+                self.queries_since_training = 0
             self.last_training_time = datetime.now()
             
             # Экспортируем для fine-tuning если достаточно данных
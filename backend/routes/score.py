@@ -13,6 +13,7 @@ from backend.database import get_session
 from backend.models import Startup, StartupScore, StartupFinancial, ExternalData
 from backend.schemas import (
     ScoreRequest, ScoreResponse, FullScoreResponse, FinancialRecord,
+    BatchScoreRequest, BatchScoreResponse,
 )
 
 logger = logging.getLogger(__name__)
@@ -20,6 +21,38 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/score", tags=["score"])
 
 
+def _proxy_scores(sc: StartupScore | None) -> dict:
+    """The six stored proxy scores of a startup (empty if not scored yet)."""
+    if not sc:
+        return {}
+    return {
+        "tech_maturity": sc.score_tech_maturity,
+        "innovation": sc.score_innovation,
+        "market_potential": sc.score_market_potential,
+        "team_readiness": sc.score_team_readiness,
+        "financial_health": sc.score_financial_health,
+        "overall": sc.score_overall,
+    }
+
+
+def _external_summary(ext_rows: list) -> dict | None:
+    """ExternalData rows (newest first) -> {source: {fetched_at, authority, data}}."""
+    if not ext_rows:
+        return None
+    external_data = {}
+    for ext in ext_rows:
+        try:
+            data = json.loads(ext.data_json)
+        except (json.JSONDecodeError, TypeError):
+            data = {}
+        external_data[ext.source] = {
+            "fetched_at": ext.fetched_at.isoformat() if ext.fetched_at else None,
+            "authority": ext.source_authority,
+            "data": data,
+        }
+    return external_data
+
+
 def _startup_to_feature_row(startup: Startup, financials: list) -> dict:
     """Convert ORM Startup + financials into a flat dict for the predictor."""
     row = {
@@ -90,7 +123,8 @@ async def get_score(
         predictor = get_predictor()
         if predictor.is_ready:
             feature_row = _startup_to_feature_row(startup, fin_rows)
-            ml_scores = predictor.predict(feature_row)
+            # One feature extraction for scores and the SHAP explanation
+            ml_scores, shap_exp = predictor.predict_and_explain(feature_row, target="overall", top_n=8)
             ml_score_val = ml_scores.get("overall")
 
             # Merge ML scores into response (ML scores override proxy scores)
@@ -104,7 +138,6 @@ async def get_score(
             })
 
             # SHAP explanation for the overall score
-            shap_exp = predictor.explain(feature_row, target="overall", top_n=8)
             if shap_exp:
                 explanation = shap_exp
 
@@ -158,8 +191,9 @@ async def score_by_name(
             from scoring.predictor import get_predictor
             predictor = get_predictor()
             if predictor.is_ready:
-                ml_scores = predictor.predict(feature_row)
-                explanation = predictor.explain(feature_row, target="overall", top_n=5)
+                ml_scores, explanation = predictor.predict_and_explain(
+                    feature_row, target="overall", top_n=5,
+                )
         except Exception:
             pass
 
@@ -210,16 +244,7 @@ async def get_full_score(
     ]
 
     # Proxy scores
-    proxy_scores = {}
-    if sc:
-        proxy_scores = {
-            "tech_maturity": sc.score_tech_maturity,
-            "innovation": sc.score_innovation,
-            "market_potential": sc.score_market_potential,
-            "team_readiness": sc.score_team_readiness,
-            "financial_health": sc.score_financial_health,
-            "overall": sc.score_overall,
-        }
+    proxy_scores = _proxy_scores(sc)
 
     # ML scores + SHAP
     ml_scores = None
@@ -233,10 +258,11 @@ async def get_full_score(
         predictor = get_predictor()
         if predictor.is_ready:
             feature_row = _startup_to_feature_row(startup, fin_rows)
-            ml_scores = predictor.predict(feature_row)
+            ml_scores, explanation = predictor.predict_and_explain(
+                feature_row, target="overall", top_n=8,
+            )
             ml_version = predictor.version
 
-            explanation = predictor.explain(feature_row, target="overall", top_n=8)
             all_explanations = predictor.explain_all(feature_row, top_n=5)
 
             # Update DB
@@ -259,18 +285,7 @@ async def get_full_score(
             )
         ).scalars().all()
 
-        if ext_rows:
-            external_data = {}
-            for ext in ext_rows:
-                try:
-                    data = json.loads(ext.data_json)
-                except (json.JSONDecodeError, TypeError):
-                    data = {}
-                external_data[ext.source] = {
-                    "fetched_at": ext.fetched_at.isoformat() if ext.fetched_at else None,
-                    "authority": ext.source_authority,
-                    "data": data,
-                }
+        external_data = _external_summary(ext_rows)
     except Exception as e:
         logger.debug("Failed to load external data: %s", e)
 
@@ -287,3 +302,104 @@ async def get_full_score(
         financials=financials,
         external_data=external_data,
     )
+
+
+@router.post("/batch", response_model=BatchScoreResponse)
+async def get_full_scores(
+    req: BatchScoreRequest,
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    /score/full for several startups in one round-trip.
+
+    Startups, financials and external data are each fetched with one
+    query, and all rows go through a single predict_and_explain_batch()
+    call. Per-target explanations (all_explanations) are left out: six
+    SHAP passes per startup is what makes /score/full slow.
+
+    At most MAX_BATCH_SCORE_IDS (100) ids per request; longer lists are
+    rejected with 422 by the request schema.
+    """
+    ids = list(dict.fromkeys(req.startup_ids))
+    if not ids:
+        return BatchScoreResponse(results=[])
+
+    rows = (
+        await session.execute(
+            select(Startup, StartupScore)
+            .outerjoin(StartupScore, Startup.id == StartupScore.startup_id)
+            .where(Startup.id.in_(ids))
+        )
+    ).all()
+    by_id = {startup.id: (startup, sc) for startup, sc in rows}
+    found = [sid for sid in ids if sid in by_id]
+    if not found:
+        return BatchScoreResponse(results=[])
+
+    fin_by_id: dict[str, list] = {sid: [] for sid in found}
+    for fin in (
+        await session.execute(
+            select(StartupFinancial)
+            .where(StartupFinancial.startup_id.in_(found))
+            .order_by(StartupFinancial.year.desc())
+        )
+    ).scalars():
+        fin_by_id[fin.startup_id].append(fin)
+
+    # ML scores + SHAP for the overall score, one pass over all rows
+    ml_scores = [None] * len(found)
+    explanations = [None] * len(found)
+    ml_version = None
+    try:
+        from scoring.predictor import get_predictor
+
+        predictor = get_predictor()
+        if predictor.is_ready:
+            feature_rows = [_startup_to_feature_row(by_id[sid][0], fin_by_id[sid]) for sid in found]
+            ml_scores, explanations = predictor.predict_and_explain_batch(
+                feature_rows, target="overall", top_n=8,
+            )
+            ml_version = predictor.version
+
+            for sid, scores in zip(found, ml_scores):
+                sc = by_id[sid][1]
+                if sc:
+                    sc.ml_score = scores.get("overall")
+                    sc.ml_model_version = ml_version
+            await session.flush()
+
+    except Exception as e:
+        logger.warning("ML prediction failed for batch score (%d startups): %s", len(found), e)
+
+    ext_by_id: dict[str, list] = {sid: [] for sid in found}
+    try:
+        for ext in (
+            await session.execute(
+                select(ExternalData)
+                .where(ExternalData.startup_id.in_(found))
+                .order_by(ExternalData.fetched_at.desc())
+            )
+        ).scalars():
+            ext_by_id[ext.startup_id].append(ext)
+    except Exception as e:
+        logger.debug("Failed to load external data: %s", e)
+
+    await session.commit()
+
+    results = []
+    for i, sid in enumerate(found):
+        startup, sc = by_id[sid]
+        results.append(FullScoreResponse(
+            startup_id=startup.id,
+            name=startup.name,
+            proxy_scores=_proxy_scores(sc),
+            ml_scores=ml_scores[i],
+            ml_model_version=ml_version,
+            explanation=explanations[i],
+            financials=[
+                FinancialRecord(year=f.year, revenue=f.revenue, profit=f.profit)
+                for f in fin_by_id[sid]
+            ],
+            external_data=_external_summary(ext_by_id[sid]),
+        ))
+    return BatchScoreResponse(results=results)
@@ -125,6 +125,19 @@ class FullScoreResponse(BaseModel):
     external_data: Optional[dict] = None
 
 
+# Upper bound on ids per /score/batch request: one IN (...) query and one
+# SHAP pass over every row run inside the request handler
+MAX_BATCH_SCORE_IDS = 100
+
+
+class BatchScoreRequest(BaseModel):
+    startup_ids: list[str] = Field(..., max_length=MAX_BATCH_SCORE_IDS)
+
+
+class BatchScoreResponse(BaseModel):
+    results: list[FullScoreResponse]  # request order; unknown ids omitted
+
+
 # ---------------------------------------------------------------------------
 # Enrichment
 # ---------------------------------------------------------------------------
@@ -241,6 +241,8 @@ async def main():
     await on_startup()
     await dp.start_polling(bot)
     await user_repository.on_end()
+    from services.deep_analysis import get_deep_analysis_service
+    await get_deep_analysis_service().close()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
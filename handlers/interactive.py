@@ -299,9 +299,9 @@ def register_interactive_handlers(
             await query.message.edit_text("🔬 Провожу глубокий анализ...")
             
             try:
-                from services.deep_analysis import DeepAnalysisService
+                from services.deep_analysis import get_deep_analysis_service
                 
-                deep_analysis_service = DeepAnalysisService()
+                deep_analysis_service = get_deep_analysis_service()
                 user_request = data.get("user_request", "")
                 
                 # Use async deep analysis with external sources
@@ -10,14 +10,14 @@ Feature groups (total ~30 features):
     Market      (5)  : IRL, industry count, product count, has_revenue, year_founded_age
     Categorical (5)  : cluster (one-hot top-N), status encoded
 
-The module exposes two key functions:
+The module exposes three key functions:
     build_feature_matrix(csv_path)  -> (X: np.ndarray, feature_names: list[str], ids: list[str])
     extract_features(row: dict)     -> np.ndarray   (single row, for runtime prediction)
+    extract_features_batch(df)      -> np.ndarray   (column-wise, for whole DataFrames)
 """
 
 from __future__ import annotations
 
-import hashlib
 import re
 from pathlib import Path
 from typing import Union
@@ -25,9 +25,17 @@ from typing import Union
 import numpy as np
 import pandas as pd
 
-from scoring.labeler import _parse_level, _parse_money, _count_patents, _count_items, _has_ai
+from scoring.labeler import (
+    PreparedStartups, _col, _count_items, _count_patents, _has_ai,
+    _parse_level, _parse_money, prepare_frame,
+)
 from scoring.bfo_ratios import ALL_BFO_FEATURE_NAMES, extract_bfo_features
 
+try:
+    import numba
+except ImportError:  # optional: the batch path falls back to pure NumPy
+    numba = None
+
 # Column mapping from Russian CSV headers to English
 COLUMN_MAP = {
     "Название компании": "name",
@@ -85,6 +93,9 @@ STATUS_MAP = {
     "На рассмотрении": 1,
 }
 
+# STATUS_MAP as a float32 lookup Series for Series.map in the batch path
+_STATUS_SERIES = pd.Series(STATUS_MAP, dtype=np.float32)
+
 
 def _safe_log1p(x: float) -> float:
     """log(1 + |x|), preserving sign."""
@@ -140,12 +151,32 @@ def _company_age(year_founded_raw) -> int:
     return 0
 
 
+def _bfo_features(bfo_data) -> np.ndarray:
+    """BFO ratio vector from {year: {code: value}} (year keys may be strings)."""
+    if not (isinstance(bfo_data, dict) and bfo_data):
+        return np.zeros(len(ALL_BFO_FEATURE_NAMES), dtype=np.float32)
+    int_keyed = {}
+    for k, v in bfo_data.items():
+        if isinstance(v, dict):
+            try:
+                int_keyed[int(k)] = v
+            except (ValueError, TypeError):
+                int_keyed[k] = v
+    return extract_bfo_features(int_keyed if int_keyed else bfo_data)
+
+
 # ---------------------------------------------------------------------------
 # Feature names (deterministic order)
 # ---------------------------------------------------------------------------
 
 def get_feature_names() -> list[str]:
-    """Return ordered list of feature names."""
+    """
+    Return ordered list of feature names.
+
+    The order is part of the saved-model contract: boosters are fed
+    positional matrices and their meta.json records this list, so columns
+    must not be reordered without retraining every target.
+    """
     names = []
 
     # Financial features (12)
@@ -199,93 +230,290 @@ def get_feature_names() -> list[str]:
     return names
 
 
+# Name -> column index, resolved once for the single-row path
+_FEATURE_NAME_TO_IDX = {name: i for i, name in enumerate(get_feature_names())}
+_NUM_FEATURES = len(_FEATURE_NAME_TO_IDX)
+
+
 # ---------------------------------------------------------------------------
 # Single-row feature extraction
 # ---------------------------------------------------------------------------
 
 def extract_features(row: dict) -> np.ndarray:
-    """Extract feature vector from a single startup dict (with English keys)."""
-    feats = []
+    """Extract the float32 feature vector from a single startup dict (with English keys)."""
+    idx = _FEATURE_NAME_TO_IDX
+    out = np.empty(_NUM_FEATURES, dtype=np.float32)
 
     # Financial: per-year log-revenues and log-profits
-    revenues = []
-    profits = []
-    for y in YEARS:
-        rev = _parse_money(row.get(f"revenue_{y}", 0))
-        prof = _parse_money(row.get(f"profit_{y}", 0))
-        revenues.append(rev)
-        profits.append(prof)
-        feats.append(_safe_log1p(rev))
-
-    for y in YEARS:
-        prof = _parse_money(row.get(f"profit_{y}", 0))
-        feats.append(_safe_log1p(prof))
+    revenues = [_parse_money(row.get(f"revenue_{y}", 0)) for y in YEARS]
+    profits = [_parse_money(row.get(f"profit_{y}", 0)) for y in YEARS]
+    i = idx[f"log_revenue_{YEARS[0]}"]
+    out[i:i + len(YEARS)] = [_safe_log1p(r) for r in revenues]
+    i = idx[f"log_profit_{YEARS[0]}"]
+    out[i:i + len(YEARS)] = [_safe_log1p(p) for p in profits]
 
     # Financial derived
-    feats.append(_safe_log1p(max(revenues) if revenues else 0))
-    feats.append(_safe_log1p(max(profits) if profits else 0))
-    feats.append(_revenue_trend(revenues))
-    feats.append(_profit_margin(revenues, profits))
-    feats.append(_revenue_stability(revenues))
-    feats.append(float(_years_with_data(revenues)))
+    i = idx["max_revenue_log"]
+    out[i:i + 6] = (
+        _safe_log1p(max(revenues) if revenues else 0),
+        _safe_log1p(max(profits) if profits else 0),
+        _revenue_trend(revenues),
+        _profit_margin(revenues, profits),
+        _revenue_stability(revenues),
+        _years_with_data(revenues),
+    )
 
     # Technology features
-    trl = _parse_level(row.get("trl_raw", row.get("trl", 0)))
-    irl = _parse_level(row.get("irl_raw", row.get("irl", 0)))
-    mrl = _parse_level(row.get("mrl_raw", row.get("mrl", 0)))
-    crl = _parse_level(row.get("crl_raw", row.get("crl", 0)))
-    feats += [float(trl), float(irl), float(mrl), float(crl)]
-
-    patent_count = _count_patents(row.get("patents", ""))
-    tech_count = _count_items(row.get("technologies", ""))
-    product_count = _count_items(row.get("product_names", ""))
-
     text_blob = " ".join(
         str(row.get(c, ""))
         for c in ["company_description", "project_description",
                    "product_description", "technologies", "product_names"]
     )
-    has_ai_flag = float(_has_ai(text_blob))
-
-    feats += [float(patent_count), float(tech_count), has_ai_flag, float(product_count)]
+    i = idx["trl"]
+    out[i:i + 8] = (
+        _parse_level(row.get("trl_raw", row.get("trl", 0))),
+        _parse_level(row.get("irl_raw", row.get("irl", 0))),
+        _parse_level(row.get("mrl_raw", row.get("mrl", 0))),
+        _parse_level(row.get("crl_raw", row.get("crl", 0))),
+        _count_patents(row.get("patents", "")),
+        _count_items(row.get("technologies", "")),
+        _has_ai(text_blob),
+        _count_items(row.get("product_names", "")),
+    )
 
     # Market features
-    industry_count = _count_items(row.get("industries", ""))
-    project_count = _count_items(row.get("project_names", ""))
-    has_revenue = float(any(r > 0 for r in revenues))
-    age = float(_company_age(row.get("year_founded", row.get("year", ""))))
-
-    feats += [float(industry_count), float(project_count), has_revenue, age]
+    i = idx["industry_count"]
+    out[i:i + 4] = (
+        _count_items(row.get("industries", "")),
+        _count_items(row.get("project_names", "")),
+        any(r > 0 for r in revenues),
+        _company_age(row.get("year_founded", row.get("year", ""))),
+    )
 
     # Categorical: cluster one-hot
     cluster = str(row.get("cluster", "")).strip()
-    for c in TOP_CLUSTERS:
-        feats.append(1.0 if cluster == c else 0.0)
+    i = idx[f"cluster_{TOP_CLUSTERS[0]}"]
+    out[i:i + len(TOP_CLUSTERS)] = [cluster == c for c in TOP_CLUSTERS]
 
     # Status encoded
     status = str(row.get("status", "")).strip()
-    feats.append(float(STATUS_MAP.get(status, 1)))
+    out[idx["status_encoded"]] = STATUS_MAP.get(status, 1)
 
-    # Text-length proxies (log-scaled)
-    for col in ["company_description", "product_description", "technologies"]:
-        feats.append(_safe_log1p(float(len(str(row.get(col, ""))))))
+    # Text-length proxies (log-scaled; lengths are >= 0, so plain log1p)
+    i = idx["len_company_desc"]
+    out[i:i + 3] = [
+        np.log1p(len(str(row.get(col, ""))))
+        for col in ["company_description", "product_description", "technologies"]
+    ]
 
     # BFO financial ratios (58 features)
-    bfo_data = row.get("bfo_financials", row.get("bfo", {}))
-    if isinstance(bfo_data, dict) and bfo_data:
-        int_keyed = {}
-        for k, v in bfo_data.items():
-            if isinstance(v, dict):
-                try:
-                    int_keyed[int(k)] = v
-                except (ValueError, TypeError):
-                    int_keyed[k] = v
-        bfo_feats = extract_bfo_features(int_keyed if int_keyed else bfo_data)
-    else:
-        bfo_feats = np.zeros(len(ALL_BFO_FEATURE_NAMES), dtype=np.float32)
-    feats.extend(bfo_feats.tolist())
-
-    return np.array(feats, dtype=np.float32)
+    i = idx[ALL_BFO_FEATURE_NAMES[0]]
+    out[i:i + len(ALL_BFO_FEATURE_NAMES)] = _bfo_features(
+        row.get("bfo_financials", row.get("bfo", {}))
+    )
+
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Batch: column-wise feature extraction
+# ---------------------------------------------------------------------------
+
+def _safe_log1p_vec(x: np.ndarray) -> np.ndarray:
+    """Vectorized _safe_log1p."""
+    return np.sign(x) * np.log1p(np.abs(x))
+
+
+if numba is not None:
+    # Row kernels for the two reductions whose split depends on how many
+    # years have revenue: one compiled sweep instead of several masked passes.
+    # Accumulators are float64 even for float32 input.
+    _ROW_KERNEL_SIGS = ["void(float32[:], float32[:])", "void(float64[:], float64[:])"]
+
+    @numba.guvectorize(_ROW_KERNEL_SIGS, "(n)->()", nopython=True, cache=True)
+    def _revenue_trend_kernel(revenues, out):
+        count = 0
+        for r in revenues:
+            if r > 0:
+                count += 1
+        out[0] = 0.0
+        if count < 2:
+            return
+        mid = count // 2
+        first_half = 0.0
+        second_half = 0.0
+        seen = 0
+        for r in revenues:
+            if r > 0:
+                if seen < mid:
+                    first_half += r
+                else:
+                    second_half += r
+                seen += 1
+        if first_half == 0:
+            first_half = 1.0
+        if second_half == 0:
+            second_half = 1.0
+        out[0] = second_half / first_half
+
+    @numba.guvectorize(_ROW_KERNEL_SIGS, "(n)->()", nopython=True, cache=True)
+    def _revenue_stability_kernel(revenues, out):
+        count = 0
+        total = 0.0
+        for r in revenues:
+            if r > 0:
+                count += 1
+                total += r
+        out[0] = 0.0
+        if count < 2:
+            return
+        mean = total / count
+        if mean == 0:
+            return
+        sq = 0.0
+        for r in revenues:
+            if r > 0:
+                sq += (r - mean) ** 2
+        out[0] = np.sqrt(sq / count) / mean
+else:
+    _revenue_trend_kernel = None
+    _revenue_stability_kernel = None
+
+
+def _revenue_trend_vec(rev: np.ndarray) -> np.ndarray:
+    """Row-wise _revenue_trend over an (N, Y) matrix (sums accumulate in float64)."""
+    if _revenue_trend_kernel is not None:
+        return _revenue_trend_kernel(rev)
+    pos = rev > 0
+    cnt = pos.sum(axis=1)
+    rank = np.cumsum(pos, axis=1)
+    first = pos & (rank <= (cnt // 2)[:, None])
+    first_sum = np.where(first, rev, 0).sum(axis=1, dtype=np.float64)
+    second_sum = np.where(pos & ~first, rev, 0).sum(axis=1, dtype=np.float64)
+    first_sum[first_sum == 0] = 1.0
+    second_sum[second_sum == 0] = 1.0
+    return np.where(cnt >= 2, second_sum / first_sum, 0.0).astype(rev.dtype)
+
+
+def _profit_margin_vec(rev: np.ndarray, prof: np.ndarray) -> np.ndarray:
+    """Row-wise _profit_margin over (N, Y) matrices."""
+    pos = rev > 0
+    cnt = pos.sum(axis=1)
+    margins = np.divide(prof, rev, out=np.zeros_like(rev), where=pos)
+    total = margins.sum(axis=1, dtype=np.float64)
+    return np.where(cnt > 0, total / np.maximum(cnt, 1), 0.0).astype(rev.dtype)
+
+
+def _revenue_stability_vec(rev: np.ndarray) -> np.ndarray:
+    """Row-wise _revenue_stability over an (N, Y) matrix (float64 accumulation)."""
+    if _revenue_stability_kernel is not None:
+        return _revenue_stability_kernel(rev)
+    pos = rev > 0
+    cnt = pos.sum(axis=1)
+    denom = np.maximum(cnt, 1)
+    mean = np.where(pos, rev, 0).sum(axis=1, dtype=np.float64) / denom
+    var = np.where(pos, (rev - mean[:, None]) ** 2, 0.0).sum(axis=1) / denom
+    ok = (cnt >= 2) & (mean != 0)
+    return np.where(ok, np.sqrt(var) / np.where(ok, mean, 1.0), 0.0).astype(rev.dtype)
+
+
+def _company_age_vec(raw: pd.Series) -> np.ndarray:
+    """Vectorized _company_age."""
+    s = raw.str.strip()
+    year = pd.to_numeric(s.where(s.str.fullmatch(r"[+-]?\d+", na=False)), errors="coerce")
+    year = year.to_numpy(dtype=np.float64, na_value=np.nan)
+    ok = (year >= 1900) & (year <= 2030)
+    return np.where(ok, 2026 - year, 0.0)
+
+
+def extract_features_batch(
+    df: pd.DataFrame,
+    bfo_map: dict | None = None,
+    prepared: PreparedStartups | None = None,
+) -> np.ndarray:
+    """
+    Column-wise equivalent of extract_features() for a whole DataFrame.
+
+    Args:
+        df:       startups with English column names (see COLUMN_MAP)
+        bfo_map:  optional inn -> BFO financials, used instead of a
+                  per-row "bfo_financials" field
+        prepared: parsed intermediates for `df` (scoring.labeler.prepare),
+                  computed here if not given
+
+    Returns:
+        (N, D) float32 feature matrix, same column order as get_feature_names()
+    """
+    prep = prepared if prepared is not None else prepare_frame(df)
+    df = prep.df
+    n = len(df)
+    n_bfo = len(ALL_BFO_FEATURE_NAMES)
+    n_features = len(get_feature_names())
+
+    # One contiguous C-order buffer; every block is written into it in place
+    X = np.empty((n, n_features), dtype=np.float32)
+    pos = 0
+
+    def put(block) -> None:
+        nonlocal pos
+        block = np.asarray(block)
+        width = 1 if block.ndim == 1 else block.shape[1]
+        X[:, pos:pos + width] = block.reshape(n, width)
+        pos += width
+
+    # Financial: (N, 6) revenue / profit matrices. Feature arithmetic runs in
+    # float32 (the output dtype); the shared money matrix stays float64 because
+    # the labeler's rouble thresholds need exact values.
+    money = prep.money.astype(np.float32)
+    rev = money[:, :len(YEARS)]
+    prof = money[:, len(YEARS):]
+    years_with_revenue = (rev > 0).sum(axis=1)
+
+    # log_revenue_* then log_profit_*: money is already laid out that way,
+    # so the whole 12-column block is one slice write
+    put(_safe_log1p_vec(money))
+    put(_safe_log1p_vec(rev.max(axis=1)))
+    put(_safe_log1p_vec(prof.max(axis=1)))
+    put(_revenue_trend_vec(rev))
+    put(_profit_margin_vec(rev, prof))
+    put(_revenue_stability_vec(rev))
+    put(years_with_revenue)
+
+    # Technology
+    put(prep.levels)
+    put(prep.patent_count)
+    put(prep.tech_count)
+    put(prep.ai_flags)
+    put(prep.product_count)
+
+    # Market
+    put(prep.industry_count)
+    put(prep.project_count)
+    put(years_with_revenue > 0)
+    put(_company_age_vec(_col(df, "year_founded", "year")))
+
+    # Categorical: cluster one-hot + status
+    # Clusters outside TOP_CLUSTERS become NaN -> all-zero row
+    cluster = pd.Categorical(_col(df, "cluster").str.strip(), categories=TOP_CLUSTERS)
+    put(pd.get_dummies(cluster).to_numpy(dtype=np.float32))
+    put(_col(df, "status").str.strip().map(_STATUS_SERIES).fillna(1.0).to_numpy(dtype=np.float32))
+
+    # Text-length proxies (log-scaled; lengths are >= 0, so plain log1p)
+    for c in ["company_description", "product_description", "technologies"]:
+        put(np.log1p(_col(df, c).str.len().to_numpy(dtype=np.float32)))
+
+    # BFO financial ratios: only rows with enrichment data need work
+    bfo = X[:, pos:pos + n_bfo]
+    bfo[:] = 0.0
+    if bfo_map:
+        for i, inn in enumerate(_col(df, "inn").str.strip()):
+            if inn and inn in bfo_map:
+                bfo[i] = _bfo_features(bfo_map[inn])
+    elif "bfo_financials" in df.columns:
+        for i, data in enumerate(df["bfo_financials"]):
+            bfo[i] = _bfo_features(data)
+
+    return X
 
 
 # ---------------------------------------------------------------------------
@@ -317,16 +545,12 @@ def build_feature_matrix(
         ids           -- list of N startup IDs (md5 of name)
         y_overall     -- (N,) proxy overall scores (target for training)
     """
-    from scoring.labeler import label_dataframe
-
-    df = pd.read_csv(csv_path, encoding="utf-8", dtype=str).fillna("")
-    for ru, en in COLUMN_MAP.items():
-        if ru in df.columns:
-            df.rename(columns={ru: en}, inplace=True)
+    from scoring.labeler import label_dataframe, prepare
 
-    df["id"] = df["name"].apply(
-        lambda x: hashlib.md5(str(x).encode()).hexdigest()
-    )
+    # Parsed once and shared with label_dataframe() (cached per file mtime)
+    prep = prepare(csv_path)
+    labels_df = label_dataframe(csv_path)
+    ids = list(prep.ids)
 
     bfo_map = _load_bfo_map()
     if bfo_map:
@@ -335,31 +559,13 @@ def build_feature_matrix(
             "BFO enrichment: %d entries loaded from skolkovo_bfo.json", len(bfo_map)
         )
 
-    labels_df = label_dataframe(csv_path)
-    label_map = {r["id"]: r for _, r in labels_df.iterrows()}
+    # Duplicate names share an id; the last labeled row wins (as a dict would)
+    y = pd.DataFrame({"id": ids}).merge(
+        labels_df.drop_duplicates("id", keep="last")[["id", "score_overall"]],
+        on="id", how="left", validate="many_to_one",
+    )["score_overall"].fillna(3.0).to_numpy(dtype=np.float32)
 
     feature_names = get_feature_names()
-    X_list = []
-    ids = []
-    y_list = []
-
-    for _, row in df.iterrows():
-        sid = row["id"]
-        row_dict = row.to_dict()
-
-        inn = str(row_dict.get("inn", "")).strip()
-        if inn and inn in bfo_map:
-            row_dict["bfo_financials"] = bfo_map[inn]
-
-        feats = extract_features(row_dict)
-        X_list.append(feats)
-        ids.append(sid)
-
-        lbl = label_map.get(sid, {})
-        y_overall = float(lbl.get("score_overall", 3.0)) if len(lbl) > 0 else 3.0
-        y_list.append(y_overall)
-
-    X = np.vstack(X_list)
-    y = np.array(y_list, dtype=np.float32)
+    X = extract_features_batch(prep.df, bfo_map, prepared=prep)
 
     return X, feature_names, ids, y
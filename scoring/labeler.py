@@ -20,13 +20,17 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import functools
 import hashlib
 import json
 import math
+import os
 import re
 import sys
+from dataclasses import dataclass, field, fields
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 ROOT = Path(__file__).resolve().parent.parent
@@ -36,25 +40,60 @@ sys.path.insert(0, str(ROOT))
 # helpers
 # ---------------------------------------------------------------------------
 
+_LEVEL_RE = re.compile(r"(?:^|;\s*)(\d)\s*:")
+_FIRST_DIGIT_RE = re.compile(r"([0-9])")
+
+
 def _parse_level(raw) -> int:
     """Extract max numeric level (0-9) from strings like '8: Описание; 6: ...'."""
-    if pd.isna(raw) or str(raw).strip() in ("", "0"):
+    if pd.isna(raw):
+        return 0
+    return _parse_level_str(str(raw))
+
+
+# Level / money cells repeat heavily (standard TRL texts, "0", ""), so the
+# string-parsing cores are memoized on the exact cell text.
+@functools.lru_cache(maxsize=4096)
+def _parse_level_str(raw: str) -> int:
+    s = raw.strip()
+    if s in ("", "0"):
         return 0
-    s = str(raw).strip()
     if s.isdigit():
         return min(int(s), 9)
-    nums = re.findall(r"(?:^|;\s*)(\d)\s*:", s)
+    nums = _LEVEL_RE.findall(s)
     if nums:
         return max(int(n) for n in nums if 0 <= int(n) <= 9)
-    m = re.search(r"[0-9]", s)
+    m = _FIRST_DIGIT_RE.search(s)
     return int(m.group()) if m else 0
 
 
+def _parse_level_column(raw: pd.Series) -> np.ndarray:
+    """
+    Vectorized _parse_level over a whole column -> (N,) int64.
+
+    Level cells repeat a small set of standard descriptions (~200 distinct
+    TRL strings over 5k startups), so each distinct value is parsed once.
+    """
+    codes, uniques = pd.factorize(raw)
+    levels = np.fromiter(
+        (_parse_level(u) for u in uniques), dtype=np.int64, count=len(uniques)
+    )
+    out = np.zeros(len(codes), dtype=np.int64)
+    present = codes >= 0  # -1 marks NaN, which parses to 0
+    out[present] = levels[codes[present]]
+    return out
+
+
 def _parse_money(raw) -> float:
     """Parse profit/revenue string -> float (rubles)."""
     if pd.isna(raw):
         return 0.0
-    s = str(raw).replace(" ", "").replace(",", ".").strip()
+    return _parse_money_str(str(raw))
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_money_str(raw: str) -> float:
+    s = raw.replace(" ", "").replace(",", ".").strip()
     if s in ("", "-", "0", "н/д", "н/а"):
         return 0.0
     try:
@@ -63,6 +102,24 @@ def _parse_money(raw) -> float:
         return 0.0
 
 
+def _parse_money_columns(df: pd.DataFrame, cols: list[str]) -> np.ndarray:
+    """
+    Vectorized _parse_money over several columns at once.
+
+    All cells are cleaned and converted in a single pass over one flat Series;
+    unparseable / missing values become 0. Returns (N, len(cols)) float64.
+    """
+    block = df.reindex(columns=cols).to_numpy(dtype=object)
+    flat = pd.Series(block.ravel(), dtype=object).fillna("").astype(str)
+    cleaned = (
+        flat.str.replace(" ", "", regex=False)
+        .str.replace(",", ".", regex=False)
+        .str.strip()
+    )
+    values = pd.to_numeric(cleaned, errors="coerce").to_numpy(dtype=np.float64, na_value=0.0)
+    return values.reshape(len(df), len(cols))
+
+
 def _clamp(val: float, lo: float = 1.0, hi: float = 10.0) -> float:
     return max(lo, min(hi, val))
 
@@ -79,6 +136,27 @@ def _count_items(raw) -> int:
     return len([x for x in str(raw).split(";") if x.strip()])
 
 
+# A ';'-separated segment that is non-empty after strip() (see _count_items)
+_ITEM_RE = r"[^;]*[^;\s][^;]*"
+
+
+def _col(df: pd.DataFrame, *names: str) -> pd.Series:
+    """First present column among `names` (mirrors chained row.get), else ''."""
+    for name in names:
+        if name in df.columns:
+            return df[name].fillna("").astype(str)
+    return pd.Series("", index=df.index, dtype=object)
+
+
+def _compute_ids(names: pd.Series) -> list[str]:
+    """Startup IDs: md5 hex of the name (stored in DB and labeled_startups.csv)."""
+    # Missing names hash as "nan" whichever CSV reader produced them (NaN / None)
+    return [
+        hashlib.md5(("nan" if pd.isna(x) else str(x)).encode()).hexdigest()
+        for x in names.to_numpy()
+    ]
+
+
 AI_KEYWORDS = {
     "искусственный интеллект", "нейросеть", "машинное обучение",
     "deep learning", "нейронная сеть", "ai", "ml",
@@ -88,9 +166,24 @@ AI_KEYWORDS = {
 }
 
 
+# One pass instead of len(AI_KEYWORDS) substring scans. Applied to lowercased
+# text (re.IGNORECASE is several times slower on Cyrillic). Plain substring
+# semantics, no word boundaries -- trained models depend on this flag.
+_AI_RE = re.compile(
+    "|".join(re.escape(kw) for kw in sorted(AI_KEYWORDS, key=len, reverse=True))
+)
+
+AI_TEXT_FIELDS = [
+    "company_description",
+    "description",
+    "product_description",
+    "technologies",
+    "product_names",
+]
+
+
 def _has_ai(text: str) -> bool:
-    t = text.lower()
-    return any(kw in t for kw in AI_KEYWORDS)
+    return _AI_RE.search(text.lower()) is not None
 
 
 # ---------------------------------------------------------------------------
@@ -230,6 +323,102 @@ def compute_overall(
     )
 
 
+# ---------------------------------------------------------------------------
+# vectorized scoring (same formulas and operation order as above, per array)
+# ---------------------------------------------------------------------------
+
+def _clamp_vec(val: np.ndarray, lo: float = 1.0, hi: float = 10.0) -> np.ndarray:
+    return np.maximum(lo, np.minimum(hi, val))
+
+
+def _score_tech_maturity_vec(trl, irl, mrl, crl) -> np.ndarray:
+    total_w = np.zeros(len(trl))
+    weighted = np.zeros(len(trl))
+    for v, w in ((trl, 0.35), (irl, 0.25), (mrl, 0.25), (crl, 0.15)):
+        total_w = total_w + np.where(v > 0, w, 0.0)
+        weighted = weighted + np.where(v > 0, v * w, 0.0)
+    has_any = total_w > 0
+    avg = weighted / np.where(has_any, total_w, 1.0)
+    return np.where(has_any, _clamp_vec(avg * 10 / 9), 1.0)
+
+
+def _score_innovation_vec(trl, patent_count, has_ai_flag, tech_count) -> np.ndarray:
+    base = 1.0 + np.minimum(trl / 3, 3.0)
+    base = base + np.select(
+        [patent_count >= 10, patent_count >= 5, patent_count >= 1], [2.5, 2.0, 1.0], 0.0
+    )
+    base = base + np.where(has_ai_flag, 1.5, 0.0)
+    base = base + np.minimum(tech_count * 0.4, 2.0)
+    return _clamp_vec(base)
+
+
+def _score_market_potential_vec(irl, industry_count, product_count, has_revenue) -> np.ndarray:
+    base = 1.0 + np.minimum(irl * 1.0, 4.0)
+    base = base + np.minimum(industry_count * 0.5, 2.0)
+    base = base + np.minimum(product_count * 0.3, 1.5)
+    base = base + np.where(has_revenue, 1.5, 0.0)
+    return _clamp_vec(base)
+
+
+def _score_team_vec(crl) -> np.ndarray:
+    return np.where(crl == 0, 3.0, _clamp_vec(crl * 10 / 9))
+
+
+def _score_financial_vec(revenues: np.ndarray, profits: np.ndarray) -> np.ndarray:
+    """score_financial() over (N, Y) matrices."""
+    rev_pos = revenues > 0
+    prof_pos = profits > 0
+    n_rev = rev_pos.sum(axis=1)
+    n_prof = prof_pos.sum(axis=1)
+
+    base = 2.0 + np.minimum(np.maximum(n_rev, n_prof) * 0.2, 1.0)
+
+    max_rev = np.where(rev_pos, revenues, -np.inf).max(axis=1)
+    base = base + np.select(
+        [n_rev == 0, max_rev >= 100_000_000, max_rev >= 10_000_000, max_rev >= 1_000_000],
+        [0.0, 3.0, 2.0, 1.0],
+        0.5,
+    )
+
+    max_prof = np.where(prof_pos, profits, -np.inf).max(axis=1)
+    base = base + np.select(
+        [n_prof == 0, max_prof >= 50_000_000, max_prof >= 5_000_000, max_prof >= 500_000],
+        [0.0, 2.0, 1.5, 1.0],
+        0.3,
+    )
+
+    # Trend: first half vs second half of the positive revenues, in year order
+    mid = n_rev // 2
+    first = rev_pos & (np.cumsum(rev_pos, axis=1) <= mid[:, None])
+    first_half = np.where(first, revenues, 0.0).sum(axis=1) / np.maximum(mid, 1)
+    second_half = (
+        np.where(rev_pos & ~first, revenues, 0.0).sum(axis=1) / np.maximum(n_rev - mid, 1)
+    )
+    growth = second_half / np.where(first_half > 0, first_half, 1.0)
+    has_trend = (n_rev >= 3) & (first_half > 0)
+    base = base + np.select(
+        [has_trend & (growth > 1.3), has_trend & (growth > 1.0)], [2.0, 1.0], 0.0
+    )
+
+    no_data = (n_rev == 0) & (n_prof == 0)
+    return np.where(no_data, 2.0, _clamp_vec(base))
+
+
+def _compute_overall_vec(tech, innov, market, team, fin) -> np.ndarray:
+    return _clamp_vec(
+        tech * 0.25
+        + innov * 0.20
+        + market * 0.20
+        + team * 0.15
+        + fin * 0.20
+    )
+
+
+def _round2(values: np.ndarray) -> list[float]:
+    # Python round(): np.round(x, 2) differs on some binary half-way values
+    return [round(v, 2) for v in values.tolist()]
+
+
 # ---------------------------------------------------------------------------
 # main pipeline
 # ---------------------------------------------------------------------------
@@ -269,85 +458,203 @@ COLUMN_MAP = {
 }
 
 
-def label_dataframe(csv_path: str | Path) -> pd.DataFrame:
-    """Read CSV, compute proxy scores, return augmented DataFrame."""
-    df = pd.read_csv(csv_path, encoding="utf-8", dtype=str)
+def read_startups_csv(csv_path: str | Path, column_map: dict[str, str]) -> pd.DataFrame:
+    """
+    Read only the columns listed in `column_map` (as str) and rename them to English.
 
-    for ru, en in COLUMN_MAP.items():
-        if ru in df.columns:
-            df.rename(columns={ru: en}, inplace=True)
+    Uses pyarrow's multithreaded CSV reader when it is installed, else the pandas
+    C parser. Missing values are left as NaN.
+    """
+    header = pd.read_csv(csv_path, encoding="utf-8", nrows=0).columns
+    usecols = [c for c in header if c in column_map]
 
-    df["id"] = df["name"].apply(
-        lambda x: hashlib.md5(str(x).encode()).hexdigest()
-    )
-    df.fillna("", inplace=True)
-
-    years = ["2025", "2024", "2023", "2022", "2021", "2020"]
-
-    rows: list[dict] = []
-    for _, row in df.iterrows():
-        trl = _parse_level(row.get("trl_raw"))
-        irl = _parse_level(row.get("irl_raw"))
-        mrl = _parse_level(row.get("mrl_raw"))
-        crl = _parse_level(row.get("crl_raw"))
-
-        patent_count = _count_patents(row.get("patents"))
-        tech_count = _count_items(row.get("technologies"))
-        industry_count = _count_items(row.get("industries"))
-        product_count = _count_items(row.get("product_names"))
-
-        text = " ".join(
-            str(row.get(c, ""))
-            for c in [
-                "company_description",
-                "description",
-                "product_description",
-                "technologies",
-                "product_names",
-            ]
-        )
-        ai_flag = _has_ai(text)
-
-        revenues = [_parse_money(row.get(f"revenue_{y}")) for y in years]
-        profits = [_parse_money(row.get(f"profit_{y}")) for y in years]
-        has_revenue = any(r > 0 for r in revenues)
-
-        s_tech = score_tech_maturity(trl, irl, mrl, crl)
-        s_innov = score_innovation(trl, patent_count, ai_flag, tech_count)
-        s_market = score_market_potential(irl, industry_count, product_count, has_revenue)
-        s_team = score_team(crl)
-        s_fin = score_financial(revenues, profits)
-        s_overall = compute_overall(s_tech, s_innov, s_market, s_team, s_fin)
-
-        rows.append(
-            {
-                "id": row.get("id", ""),
-                "name": row.get("name", ""),
-                "inn": row.get("inn", ""),
-                "cluster": row.get("cluster", ""),
-                "status": row.get("status", ""),
-                "year": row.get("year", ""),
-                "trl": trl,
-                "irl": irl,
-                "mrl": mrl,
-                "crl": crl,
-                "patent_count": patent_count,
-                "has_ai": int(ai_flag),
-                "tech_count": tech_count,
-                "industry_count": industry_count,
-                "product_count": product_count,
-                "max_revenue": max(revenues),
-                "max_profit": max(profits),
-                "score_tech_maturity": round(s_tech, 2),
-                "score_innovation": round(s_innov, 2),
-                "score_market_potential": round(s_market, 2),
-                "score_team_readiness": round(s_team, 2),
-                "score_financial_health": round(s_fin, 2),
-                "score_overall": round(s_overall, 2),
-            }
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+    except ImportError:
+        df = pd.read_csv(csv_path, encoding="utf-8", dtype=str, usecols=usecols)
+    else:
+        # pandas' engine="pyarrow" can't enable newlines_in_values, and the
+        # Skolkovo descriptions contain quoted line breaks
+        table = pa_csv.read_csv(
+            csv_path,
+            parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=usecols,
+                column_types={c: pa.string() for c in usecols},
+                strings_can_be_null=True,
+            ),
         )
+        df = table.to_pandas()
+
+    return df.rename(columns=column_map)
+
+
+YEARS = ["2025", "2024", "2023", "2022", "2021", "2020"]
 
-    return pd.DataFrame(rows)
+
+@dataclass
+class PreparedStartups:
+    """
+    Parsed per-startup intermediates shared by label_dataframe() and
+    scoring.features.extract_features_batch(). Treat as read-only: prepare()
+    returns the same cached instance to every caller.
+    """
+
+    df: pd.DataFrame            # English column names, missing values as ""
+    money: np.ndarray           # (N, 12): revenue YEARS..., then profit YEARS...
+    levels: np.ndarray          # (N, 4): trl, irl, mrl, crl
+    patent_count: np.ndarray
+    tech_count: np.ndarray
+    industry_count: np.ndarray
+    product_count: np.ndarray
+    project_count: np.ndarray
+    ai_flags: np.ndarray        # (N,) bool
+    ids: list[str] = field(default_factory=list)
+
+    @property
+    def revenues(self) -> np.ndarray:
+        return self.money[:, :len(YEARS)]
+
+    @property
+    def profits(self) -> np.ndarray:
+        return self.money[:, len(YEARS):]
+
+    def slice(self, start: int, stop: int) -> PreparedStartups:
+        """Rows [start, stop) as a new PreparedStartups (views, no copies)."""
+        return PreparedStartups(**{
+            f.name: (
+                self.df.iloc[start:stop] if f.name == "df"
+                else getattr(self, f.name)[start:stop]
+            )
+            for f in fields(self)
+        })
+
+
+def prepare_frame(df: pd.DataFrame) -> PreparedStartups:
+    """
+    Parse money, readiness levels, list counts and the AI flag for every row.
+
+    Accepts both this module's column names and scoring.features' names
+    (project_description / description, trl_raw / trl).
+    """
+    df = df.fillna("")
+
+    blob = _col(df, "company_description").str.cat(
+        [
+            _col(df, "description", "project_description"),
+            _col(df, "product_description"),
+            _col(df, "technologies"),
+            _col(df, "product_names"),
+        ],
+        sep=" ",
+    )
+
+    return PreparedStartups(
+        df=df,
+        money=_parse_money_columns(
+            df, [f"revenue_{y}" for y in YEARS] + [f"profit_{y}" for y in YEARS]
+        ),
+        levels=np.column_stack([
+            _parse_level_column(_col(df, f"{lvl}_raw", lvl))
+            for lvl in ("trl", "irl", "mrl", "crl")
+        ]),
+        patent_count=_col(df, "patents").str.count(_ITEM_RE).to_numpy(dtype=np.int64),
+        tech_count=_col(df, "technologies").str.count(_ITEM_RE).to_numpy(dtype=np.int64),
+        industry_count=_col(df, "industries").str.count(_ITEM_RE).to_numpy(dtype=np.int64),
+        product_count=_col(df, "product_names").str.count(_ITEM_RE).to_numpy(dtype=np.int64),
+        project_count=_col(df, "project_names").str.count(_ITEM_RE).to_numpy(dtype=np.int64),
+        ai_flags=blob.str.lower().str.contains(_AI_RE).to_numpy(dtype=bool),
+    )
+
+
+@functools.lru_cache(maxsize=2)
+def _prepare_cached(path: str, mtime_ns: int) -> PreparedStartups:
+    df = read_startups_csv(path, COLUMN_MAP)
+    ids = _compute_ids(df["name"])
+    prep = prepare_frame(df)
+    prep.ids = ids
+    return prep
+
+
+def prepare(csv_path: str | Path) -> PreparedStartups:
+    """Read + parse the CSV once; cached until the file's mtime changes."""
+    path = Path(csv_path).resolve()
+    return _prepare_cached(str(path), path.stat().st_mtime_ns)
+
+
+# Below this many rows process start-up costs more than it saves
+PARALLEL_MIN_ROWS = 50_000
+
+
+def label_dataframe(csv_path: str | Path, n_jobs: int = 1) -> pd.DataFrame:
+    """
+    Read CSV, compute proxy scores, return augmented DataFrame.
+
+    With n_jobs != 1 and at least PARALLEL_MIN_ROWS rows, scoring is split
+    into contiguous row partitions run in worker processes (n_jobs <= 0
+    means one per CPU). Output is identical to the sequential path.
+    """
+    prep = prepare(csv_path)
+    n = len(prep.df)
+    if n_jobs == 1 or n < PARALLEL_MIN_ROWS:
+        return _label_partition(prep)
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    if n_jobs <= 0:
+        n_jobs = os.cpu_count() or 1
+    bounds = np.linspace(0, n, n_jobs + 1, dtype=int)
+    parts = [prep.slice(a, b) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+    with ProcessPoolExecutor(max_workers=len(parts)) as pool:
+        frames = list(pool.map(_label_partition, parts))
+    return pd.concat(frames, ignore_index=True)
+
+
+def _label_partition(prep: PreparedStartups) -> pd.DataFrame:
+    """Score every row of `prep` (a whole dataset or one partition of it)."""
+    df = prep.df
+    trl, irl, mrl, crl = prep.levels.T
+    revenues = prep.revenues
+    profits = prep.profits
+    has_revenue = (revenues > 0).any(axis=1)
+
+    s_tech = _score_tech_maturity_vec(trl, irl, mrl, crl)
+    s_innov = _score_innovation_vec(trl, prep.patent_count, prep.ai_flags, prep.tech_count)
+    s_market = _score_market_potential_vec(
+        irl, prep.industry_count, prep.product_count, has_revenue
+    )
+    s_team = _score_team_vec(crl)
+    s_fin = _score_financial_vec(revenues, profits)
+    s_overall = _compute_overall_vec(s_tech, s_innov, s_market, s_team, s_fin)
+
+    return pd.DataFrame(
+        {
+            "id": prep.ids,
+            "name": _col(df, "name").tolist(),
+            "inn": _col(df, "inn").tolist(),
+            "cluster": _col(df, "cluster").tolist(),
+            "status": _col(df, "status").tolist(),
+            "year": _col(df, "year").tolist(),
+            "trl": trl,
+            "irl": irl,
+            "mrl": mrl,
+            "crl": crl,
+            "patent_count": prep.patent_count,
+            "has_ai": prep.ai_flags.astype(np.int64),
+            "tech_count": prep.tech_count,
+            "industry_count": prep.industry_count,
+            "product_count": prep.product_count,
+            "max_revenue": revenues.max(axis=1),
+            "max_profit": profits.max(axis=1),
+            "score_tech_maturity": _round2(s_tech),
+            "score_innovation": _round2(s_innov),
+            "score_market_potential": _round2(s_market),
+            "score_team_readiness": _round2(s_team),
+            "score_financial_health": _round2(s_fin),
+            "score_overall": _round2(s_overall),
+        }
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -359,10 +666,12 @@ def main():
     parser.add_argument("--csv", default=str(ROOT / "SkolkovoStartups.csv"))
     parser.add_argument("--out", default=str(ROOT / "scoring" / "labeled_startups.csv"))
     parser.add_argument("--json", action="store_true", help="Also write JSON")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help=f"Worker processes for >= {PARALLEL_MIN_ROWS} rows (0 = all CPUs)")
     args = parser.parse_args()
 
     print(f"Reading {args.csv} ...")
-    result = label_dataframe(args.csv)
+    result = label_dataframe(args.csv, n_jobs=args.jobs)
     result.to_csv(args.out, index=False, encoding="utf-8")
     print(f"Wrote {len(result)} labeled startups -> {args.out}")
 
@@ -7,6 +7,8 @@ Usage in bot code:
     # -> {"DeepTech": 3, "GenAI": "есть", "WOW": "да", "TrafficLight": 3,
     #     "Comments": "...", "ml_scores": {...}, "ml_available": True}
 
+    results = ml_analyze_batch([startup_a, startup_b])   # one predict + SHAP pass
+
 Falls back gracefully if models are not trained yet.
 """
 
@@ -68,25 +70,57 @@ FEATURE_LABELS_RU = {
 }
 
 
+# feature -> short label (the hint half of FEATURE_LABELS_RU is not shown in comments)
+_LABEL_CACHE: dict[str, str] = {k: v[0] for k, v in FEATURE_LABELS_RU.items()}
+
+
 def _format_shap_factor(feature: str, contribution: float) -> str:
     """Format a SHAP factor into human-readable Russian text."""
-    label, hint = FEATURE_LABELS_RU.get(feature, (feature, ""))
-    direction = "повышает оценку" if contribution > 0 else "снижает оценку"
-    sign = "+" if contribution > 0 else ""
-    icon = "✅" if contribution > 0 else "⚠️"
-    return f"   {icon} {label} ({sign}{contribution:.2f}) — {direction}"
+    label = _LABEL_CACHE.get(feature, feature)
+    if contribution > 0:
+        return f"   ✅ {label} (+{contribution:.2f}) — повышает оценку"
+    return f"   ⚠️ {label} ({contribution:.2f}) — снижает оценку"
+
+
+# GenAI flag keywords (narrower than labeler.AI_KEYWORDS), matched on lowercased text.
+# Plain substring semantics on purpose: \b would drop matches the keyword
+# test has always counted, and re.IGNORECASE is ~4x slower than .lower() on
+# Cyrillic text.
+_GENAI_FIELDS = ["company_description", "description",
+                 "product_description", "technologies"]
+_GENAI_RE = re.compile("|".join(re.escape(kw) for kw in [
+    "искусственный интеллект", "машинное обучение", "нейронная сеть",
+    "нейросеть", "ai", "ml",
+]))
+
+# Fixed part of the Comments text; the leading "\n" is the blank separator line
+_ML_SCORES_TEMPLATE = (
+    "\n🧠 ML-скоринг (6 измерений, XGBoost):\n"
+    "   ⭐ Общий балл: {overall:.1f}/10\n"
+    "   🔬 Технологическая зрелость: {tech:.1f}/10\n"
+    "   💡 Инновационность: {innov:.1f}/10\n"
+    "   📈 Рыночный потенциал: {market:.1f}/10\n"
+    "   👥 Готовность команды: {team:.1f}/10\n"
+    "   💰 Финансовое здоровье: {financial:.1f}/10"
+)
+_SHAP_HEADER = "\n📊 Ключевые факторы оценки:"
 
 _predictor = None
 _predictor_checked = False
 
 
 def _get_predictor():
-    """Lazy-load the predictor singleton."""
+    """
+    Lazy-load the predictor singleton.
+
+    _predictor is assigned before _predictor_checked is set, so a caller that
+    sees the flag (see the inline fast path in ml_analyze_*) never reads a
+    half-initialised None.
+    """
     global _predictor, _predictor_checked
     if _predictor_checked:
         return _predictor
 
-    _predictor_checked = True
     try:
         from scoring.predictor import get_predictor
         p = get_predictor()
@@ -100,6 +134,7 @@ def _get_predictor():
     except Exception as e:
         logger.warning("ML scoring unavailable: %s", e)
 
+    _predictor_checked = True
     return _predictor
 
 
@@ -110,112 +145,161 @@ def ml_analyze_startup(startup: dict) -> Optional[dict]:
     Returns a dict compatible with the old analyze_startup() format,
     enriched with ML scores. Returns None if ML is not available.
     """
-    predictor = _get_predictor()
+    predictor = _predictor if _predictor_checked else _get_predictor()
     if predictor is None:
         return None
 
     try:
-        # Predict all 6 dimensions
-        scores = predictor.predict(startup)
-        overall = scores.get("overall", 0)
-        tech = scores.get("tech_maturity", 0)
-        innov = scores.get("innovation", 0)
-        market = scores.get("market_potential", 0)
-        team = scores.get("team_readiness", 0)
-        financial = scores.get("financial_health", 0)
-
-        # Map ML scores to the old format for backward compatibility
-        # DeepTech: 1-3 based on tech_maturity
-        if tech >= 7:
-            deeptech = 3
-        elif tech >= 4.5:
-            deeptech = 2
-        else:
-            deeptech = 1
-
-        # GenAI: check innovation + has_ai feature
-        has_ai = any(
-            kw in " ".join(
-                str(startup.get(f, "")).lower()
-                for f in ["company_description", "description",
-                          "product_description", "technologies"]
-            )
-            for kw in ["ai", "ml", "искусственный интеллект",
-                        "нейросеть", "машинное обучение", "нейронная сеть"]
+        # Predict all 6 dimensions + SHAP for overall on one feature vector
+        scores, shap_result = predictor.predict_and_explain(
+            startup, target="overall", top_n=3
         )
-        genai = "есть" if (has_ai or innov >= 7) else "нет"
+        return _build_result(startup, scores, shap_result)
+    except Exception as e:
+        logger.warning("ML scoring failed for %s: %s", startup.get("name", "?"), e)
+        return None
 
-        # WOW
-        wow = "да" if (deeptech == 3 and genai == "есть" and overall >= 7) else "нет"
 
-        # TrafficLight: 1-3 based on overall score
-        if overall >= 7:
-            traffic_light = 3  # Green
-        elif overall >= 4.5:
-            traffic_light = 2  # Yellow
-        else:
-            traffic_light = 1  # Red
-
-        # Build rich comments
-        comments = []
-
-        cluster = startup.get("cluster", "")
-        if cluster:
-            comments.append(f"📌 Кластер: {cluster}")
-
-        status = startup.get("status", "")
-        if status:
-            comments.append(f"📊 Статус: {status}")
-
-        technologies = startup.get("technologies", "")
-        if technologies and len(technologies) > 10:
-            tech_short = technologies[:100] + "..." if len(technologies) > 100 else technologies
-            comments.append(f"🔧 Технологии: {tech_short}")
-
-        # ML scores breakdown
-        comments.append("")
-        comments.append("🧠 ML-скоринг (6 измерений, XGBoost):")
-        comments.append(f"   ⭐ Общий балл: {overall:.1f}/10")
-        comments.append(f"   🔬 Технологическая зрелость: {tech:.1f}/10")
-        comments.append(f"   💡 Инновационность: {innov:.1f}/10")
-        comments.append(f"   📈 Рыночный потенциал: {market:.1f}/10")
-        comments.append(f"   👥 Готовность команды: {team:.1f}/10")
-        comments.append(f"   💰 Финансовое здоровье: {financial:.1f}/10")
-
-        # SHAP explanation (top factors) with human-readable labels
-        try:
-            shap_result = predictor.explain(startup, target="overall", top_n=3)
-            if shap_result:
-                comments.append("")
-                comments.append("📊 Ключевые факторы оценки:")
-                for factor in shap_result.get("top_positive", [])[:3]:
-                    comments.append(_format_shap_factor(
-                        factor["feature"], factor["contribution"]
-                    ))
-                for factor in shap_result.get("top_negative", [])[:2]:
-                    comments.append(_format_shap_factor(
-                        factor["feature"], factor["contribution"]
-                    ))
-        except Exception:
-            pass
-
-        comment = "\n".join(comments)
-
-        return {
-            "DeepTech": deeptech,
-            "GenAI": genai,
-            "WOW": wow,
-            "TrafficLight": traffic_light,
-            "Comments": comment,
-            "FinancialStability": "ML-оценка",
-            "AvgProfit": 0,
-            "FinancialHealth": f"{financial:.1f}/10",
-            # New ML-specific fields
-            "ml_scores": scores,
-            "ml_available": True,
-            "ml_overall": overall,
-        }
+def ml_analyze_batch(startups: list[dict]) -> list[Optional[dict]]:
+    """
+    Batch version of ml_analyze_startup(): features, the six model predictions
+    and the overall SHAP values are each computed once over all rows.
 
+    Returns a list aligned with `startups`; items are None where ML is
+    unavailable or scoring failed.
+    """
+    predictor = _predictor if _predictor_checked else _get_predictor()
+    if predictor is None or not startups:
+        return [None] * len(startups)
+
+    try:
+        all_scores, explanations = predictor.predict_and_explain_batch(
+            startups, target="overall", top_n=3
+        )
     except Exception as e:
-        logger.warning("ML scoring failed for %s: %s", startup.get("name", "?"), e)
-        return None
+        logger.warning("ML batch scoring failed (%d startups): %s", len(startups), e)
+        return [None] * len(startups)
+
+    genai_flags = _genai_flags(startups)
+
+    results = []
+    for startup, scores, shap_result, has_ai in zip(
+        startups, all_scores, explanations, genai_flags
+    ):
+        try:
+            results.append(_build_result(startup, scores, shap_result, has_ai=has_ai))
+        except Exception as e:
+            logger.warning("ML scoring failed for %s: %s", startup.get("name", "?"), e)
+            results.append(None)
+    return results
+
+
+def _has_genai(startup: dict) -> bool:
+    """GenAI keyword match over the startup's text fields."""
+    return _GENAI_RE.search(
+        " ".join(str(startup.get(f, "")) for f in _GENAI_FIELDS).lower()
+    ) is not None
+
+
+def _genai_flags(startups: list[dict]) -> list[bool]:
+    """_has_genai() for many startups: one concat + lower + regex pass per column."""
+    import pandas as pd
+
+    text = pd.DataFrame.from_records(startups, columns=_GENAI_FIELDS).fillna("").astype(str)
+    blob = text[_GENAI_FIELDS[0]].str.cat([text[f] for f in _GENAI_FIELDS[1:]], sep=" ")
+    return blob.str.lower().str.contains(_GENAI_RE).tolist()
+
+
+def _build_result(
+    startup: dict,
+    scores: dict,
+    shap_result: Optional[dict],
+    has_ai: Optional[bool] = None,
+) -> dict:
+    """
+    Map ML scores (+ optional SHAP factors) to the analyze_startup() format.
+
+    `has_ai` may be precomputed for batches (see _genai_flags).
+    """
+    overall = scores.get("overall", 0)
+    tech = scores.get("tech_maturity", 0)
+    innov = scores.get("innovation", 0)
+    market = scores.get("market_potential", 0)
+    team = scores.get("team_readiness", 0)
+    financial = scores.get("financial_health", 0)
+
+    # Map ML scores to the old format for backward compatibility
+    # DeepTech: 1-3 based on tech_maturity
+    if tech >= 7:
+        deeptech = 3
+    elif tech >= 4.5:
+        deeptech = 2
+    else:
+        deeptech = 1
+
+    # GenAI: check innovation + has_ai feature
+    if has_ai is None:
+        has_ai = _has_genai(startup)
+    genai = "есть" if (has_ai or innov >= 7) else "нет"
+
+    # WOW
+    wow = "да" if (deeptech == 3 and genai == "есть" and overall >= 7) else "нет"
+
+    # TrafficLight: 1-3 based on overall score
+    if overall >= 7:
+        traffic_light = 3  # Green
+    elif overall >= 4.5:
+        traffic_light = 2  # Yellow
+    else:
+        traffic_light = 1  # Red
+
+    # Build rich comments
+    comments = []
+
+    cluster = startup.get("cluster", "")
+    if cluster:
+        comments.append(f"📌 Кластер: {cluster}")
+
+    status = startup.get("status", "")
+    if status:
+        comments.append(f"📊 Статус: {status}")
+
+    technologies = startup.get("technologies", "")
+    if technologies and len(technologies) > 10:
+        tech_short = technologies[:100] + "..." if len(technologies) > 100 else technologies
+        comments.append(f"🔧 Технологии: {tech_short}")
+
+    # ML scores breakdown
+    comments.append(_ML_SCORES_TEMPLATE.format(
+        overall=overall, tech=tech, innov=innov,
+        market=market, team=team, financial=financial,
+    ))
+
+    # SHAP explanation (top factors) with human-readable labels
+    if shap_result:
+        comments.append(_SHAP_HEADER)
+        comments.extend(
+            _format_shap_factor(factor["feature"], factor["contribution"])
+            for factor in (
+                *shap_result.get("top_positive", [])[:3],
+                *shap_result.get("top_negative", [])[:2],
+            )
+        )
+
+    # One join over the few collected pieces (measured faster than io.StringIO here)
+    comment = "\n".join(comments)
+
+    return {
+        "DeepTech": deeptech,
+        "GenAI": genai,
+        "WOW": wow,
+        "TrafficLight": traffic_light,
+        "Comments": comment,
+        "FinancialStability": "ML-оценка",
+        "AvgProfit": 0,
+        "FinancialHealth": f"{financial:.1f}/10",
+        # New ML-specific fields
+        "ml_scores": scores,
+        "ml_available": True,
+        "ml_overall": overall,
+    }
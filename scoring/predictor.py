@@ -2,27 +2,64 @@
 Phase 2 -- Prediction Service + SHAP Explanations.
 
 Loads trained models and provides:
-    predict(row)      -> dict of scores
-    explain(row)      -> dict of SHAP feature contributions
-
-Thread-safe singleton that lazily loads models on first call.
+    predict(row)              -> dict of scores
+    explain(row)              -> dict of SHAP feature contributions
+    predict_and_explain(row)  -> both, extracting features once
+    *_batch(rows)             -> the same over a list, one model/SHAP call each
+
+Thread-safe singleton that lazily loads models on first call, or eagerly
+via preload() -- call that in the parent of a pre-fork server so workers
+share the loaded models copy-on-write:
+
+    # gunicorn.conf.py
+    preload_app = True
+
+    def on_starting(server):
+        from scoring.predictor import get_predictor
+        get_predictor().preload()
+
+If treelite + tl2cgen are installed, each model is also compiled ahead of
+time into a shared library (cached next to model_latest.joblib, keyed by
+the model file hash) and predict() runs through it; SHAP still uses the
+original XGBoost model.
+
+Loaded models are pinned to one thread (nthread=1 / n_jobs=1): for the
+1-row ml_analyze_startup path OpenMP thread start-up costs more than the
+trees themselves, and the six targets run concurrently instead (see
+predict_multi). OMP_NUM_THREADS is deliberately left alone, since
+retrain.py trains with n_jobs=-1 in the same process.
 """
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
+import os
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from threading import Lock
 from typing import Optional
 
 import numpy as np
 
+try:  # optional: AOT-compiled tree inference, falls back to XGBoost predict()
+    import tl2cgen
+    import treelite
+except ImportError:
+    tl2cgen = None
+    treelite = None
+
 logger = logging.getLogger(__name__)
 
 ROOT = Path(__file__).resolve().parent.parent
 DEFAULT_MODEL_DIR = ROOT / "scoring" / "models"
 
+# Most recent (target, feature vector) -> SHAP values kept by explain()
+SHAP_CACHE_SIZE = 32
+
 TARGET_NAMES = [
     "overall",
     "tech_maturity",
@@ -33,19 +70,182 @@ TARGET_NAMES = [
 ]
 
 
+def _get_booster(model):
+    """Underlying Booster of an sklearn-API model (or the model itself)."""
+    return model.get_booster() if hasattr(model, "get_booster") else model
+
+
+def _load_model_file(model_path: Path):
+    """
+    Load one target's model, preferring the boosters' native formats.
+
+    model_latest.ubj (XGBoost) or model_latest.txt (LightGBM), written by
+    save_model() or, for .ubj, here on first load, is smaller and faster to
+    load than the pickle. Either is ignored once it is older than the
+    .joblib, i.e. after a retrain replaced the pickle. XGBoost comes back as
+    an sklearn-API model, as retrain.py expects; LightGBM as a plain Booster,
+    which predict() and SHAP handle the same way.
+    """
+    import joblib
+
+    joblib_mtime = model_path.stat().st_mtime_ns
+
+    ubj_path = model_path.with_suffix(".ubj")
+    if ubj_path.exists() and ubj_path.stat().st_mtime_ns >= joblib_mtime:
+        try:
+            import xgboost as xgb
+
+            model = xgb.XGBRegressor()
+            model.load_model(str(ubj_path))
+            return model
+        except Exception as e:
+            logger.warning("Failed to load %s, falling back to joblib: %s", ubj_path, e)
+
+    txt_path = model_path.with_suffix(".txt")
+    if txt_path.exists() and txt_path.stat().st_mtime_ns >= joblib_mtime:
+        try:
+            import lightgbm as lgb
+
+            return lgb.Booster(model_file=str(txt_path))
+        except Exception as e:
+            logger.warning("Failed to load %s, falling back to joblib: %s", txt_path, e)
+
+    # No mmap_mode: save_model() compresses the pickle, which cannot be
+    # memory-mapped (and a booster holds no large ndarrays to share anyway)
+    model = joblib.load(model_path)
+    if hasattr(model, "get_booster"):  # xgboost sklearn API
+        _export_ubj(model, ubj_path)
+    return model
+
+
+def _export_ubj(model, ubj_path: Path):
+    """Write `model` as .ubj; a temp file + rename keeps concurrent loaders safe."""
+    tmp_path = ubj_path.with_name(f"{ubj_path.stem}.{os.getpid()}.tmp.ubj")
+    try:
+        model.save_model(str(tmp_path))
+        os.replace(tmp_path, ubj_path)
+    except Exception as e:
+        logger.warning("Could not export %s: %s", ubj_path, e)
+        tmp_path.unlink(missing_ok=True)
+
+
+def _pin_single_thread(model):
+    """Run inference for `model` on the calling thread only."""
+    if hasattr(model, "set_params"):
+        model.set_params(n_jobs=1)
+    booster = _get_booster(model)
+    if hasattr(booster, "set_param"):
+        booster.set_param({"nthread": 1})
+    return booster
+
+
+def _top_by_magnitude(values: np.ndarray, idx: np.ndarray, k: int) -> np.ndarray:
+    """
+    idx of the k largest `values`, largest first; ties keep idx order.
+
+    np.partition finds the k-th largest value in O(n); only entries at or
+    above it are sorted.
+    """
+    if len(idx) > k > 0:
+        kth = np.partition(values, len(values) - k)[len(values) - k]
+        keep = values >= kth
+        values, idx = values[keep], idx[keep]
+    return idx[np.argsort(-values, kind="stable")[:k]]
+
+
+class _CompiledModel:
+    """tl2cgen predictor with the XGBRegressor-style .predict(x) interface."""
+
+    def __init__(self, libpath: Path):
+        self._predictor = tl2cgen.Predictor(str(libpath))
+
+    def predict(self, x) -> np.ndarray:
+        if not isinstance(x, tl2cgen.DMatrix):
+            x = tl2cgen.DMatrix(np.ascontiguousarray(x, dtype=np.float32))
+        return np.asarray(self._predictor.predict(x)).reshape(-1)
+
+
+def _compile_model(model, model_path: Path) -> Optional[_CompiledModel]:
+    """
+    Compile an XGBoost model with treelite/tl2cgen, reusing a cached .so.
+
+    The library is named after the model file hash, so a retrained
+    model_latest.joblib gets recompiled once and old libraries are ignored.
+    """
+    if tl2cgen is None:
+        return None
+
+    digest = hashlib.md5(model_path.read_bytes()).hexdigest()[:12]
+    libpath = model_path.with_name(f"{model_path.stem}_{digest}.so")
+    try:
+        if not libpath.exists():
+            tl_model = treelite.frontend.from_xgboost(_get_booster(model))
+            tl2cgen.export_lib(
+                tl_model, toolchain="gcc", libpath=str(libpath),
+                params={"parallel_comp": 32},
+            )
+            logger.info("Compiled %s -> %s", model_path, libpath.name)
+        return _CompiledModel(libpath)
+    except Exception as e:
+        logger.warning("Treelite compilation failed for %s: %s", model_path, e)
+        return None
+
+
 class StartupPredictor:
     """
     Loads XGBoost / LightGBM models and computes predictions + SHAP explanations.
+
+    Feature vectors are float32 and C-contiguous end to end (the dtype
+    XGBoost predicts in), so no hidden float64 -> float32 copy happens
+    inside the model or explainer calls.
     """
 
     def __init__(self, model_dir: Path | str | None = None):
         self._model_dir = Path(model_dir) if model_dir else DEFAULT_MODEL_DIR
         self._models: dict = {}
+        self._compiled: dict = {}
+        self._boosters: dict = {}
+        self._runners: tuple = ()
         self._meta: dict = {}
         self._explainers: dict = {}
+        self._shap_cache: OrderedDict = OrderedDict()
+        self._shap_cache_lock = Lock()
         self._feature_names: list[str] = []
+        self._feature_names_arr: np.ndarray = np.empty(0, dtype=object)
         self._loaded = False
         self._lock = Lock()
+        self._executor = self._new_executor()
+        _instances.add(self)
+
+    @staticmethod
+    def _new_executor() -> ThreadPoolExecutor:
+        # Six single-threaded models side by side (see _pin_single_thread)
+        return ThreadPoolExecutor(
+            max_workers=len(TARGET_NAMES), thread_name_prefix="scoring-predict",
+        )
+
+    def _after_fork(self):
+        """
+        Re-create the thread pool and locks in a forked child.
+
+        Pool threads don't exist in the child and a lock may have been held
+        by another parent thread at fork time; the loaded models are kept.
+        """
+        self._lock = Lock()
+        self._shap_cache_lock = Lock()
+        self._executor = self._new_executor()
+
+    def preload(self) -> "StartupPredictor":
+        """
+        Load and warm up all models now instead of on the first request.
+
+        Meant for the parent process of a pre-fork server (see the module
+        docstring): models are read from disk once and forked workers share
+        those pages instead of each deserializing six models.
+        """
+        if not self._loaded:
+            self._ensure_loaded()
+        return self
 
     # ------------------------------------------------------------------
     # Lazy loading
@@ -62,8 +262,6 @@ class StartupPredictor:
 
     def _load_models(self):
         """Load all target models from disk."""
-        import joblib
-
         loaded = 0
         for target in TARGET_NAMES:
             model_path = self._model_dir / target / "model_latest.joblib"
@@ -73,7 +271,17 @@ class StartupPredictor:
                 logger.warning("Model not found for target '%s': %s", target, model_path)
                 continue
 
-            self._models[target] = joblib.load(model_path)
+            model = _load_model_file(model_path)
+            booster = _pin_single_thread(model)
+            self._models[target] = model
+            # Raw booster for inplace_predict (no DMatrix per call); _models
+            # keeps the sklearn wrapper for SHAP and retrain.py
+            if hasattr(booster, "inplace_predict"):
+                self._boosters[target] = booster
+
+            compiled = _compile_model(self._models[target], model_path)
+            if compiled is not None:
+                self._compiled[target] = compiled
 
             if meta_path.exists():
                 self._meta[target] = json.loads(meta_path.read_text(encoding="utf-8"))
@@ -82,18 +290,71 @@ class StartupPredictor:
 
             loaded += 1
 
-        logger.info("Loaded %d/%d scoring models from %s", loaded, len(TARGET_NAMES), self._model_dir)
+        logger.info(
+            "Loaded %d/%d scoring models from %s (%d compiled)",
+            loaded, len(TARGET_NAMES), self._model_dir, len(self._compiled),
+        )
+
+        from scoring.features import get_feature_names
+
+        # Names for SHAP output, gathered by index in _explanation()
+        self._feature_names_arr = np.array(
+            self._feature_names or [f"f{i}" for i in range(len(get_feature_names()))],
+            dtype=object,
+        )
+        self._runners = tuple(self._make_runner(t) for t in TARGET_NAMES if t in self._models)
+        self._warm_up()
+
+    def _make_runner(self, target: str) -> tuple:
+        """
+        (target, bound predict callable, takes tl2cgen input) for one model.
+
+        Resolved once after loading, so predict_multi doesn't re-decide
+        between the compiled, inplace and sklearn paths on every call.
+        """
+        compiled = self._compiled.get(target)
+        if compiled is not None:
+            return target, compiled.predict, True
+        booster = self._boosters.get(target)
+        if booster is not None:
+            return target, booster.inplace_predict, False
+        return target, self._models[target].predict, False
+
+    def _warm_up(self):
+        """
+        Run every model and SHAP explainer once on a zero row.
+
+        The first predict()/shap_values() calls are several times slower
+        than steady state (lazy buffers, explainer construction, pool
+        threads); paying that here keeps it off the first bot request.
+        Failures are logged and never block serving.
+        """
+        dummy = np.zeros((1, len(self._feature_names_arr)), dtype=np.float32)
+
+        def warm(target: str):
+            try:
+                self._predict_raw(target, dummy)
+                explainer = self._get_explainer(target)
+                if explainer is not None:
+                    explainer.shap_values(dummy)
+            except Exception as e:
+                logger.warning("Warm-up failed for %s: %s", target, e)
+
+        # Through the pool, so its worker threads exist before the first request
+        list(self._executor.map(warm, list(self._models)))
 
     @property
     def is_ready(self) -> bool:
         """True if at least the 'overall' model is loaded."""
-        self._ensure_loaded()
+        if not self._loaded:
+            self._ensure_loaded()
         return "overall" in self._models
 
     @property
     def version(self) -> Optional[str]:
         """Version string of the overall model."""
-        self._ensure_loaded()
+        if not self._loaded:
+            self._ensure_loaded()
         meta = self._meta.get("overall", {})
         return meta.get("version")
 
@@ -101,49 +362,163 @@ class StartupPredictor:
     # Prediction
     # ------------------------------------------------------------------
 
-    def predict(self, row: dict) -> dict[str, float]:
+    def _predict_raw(self, target: str, x: np.ndarray) -> np.ndarray:
+        """Raw output of a single target model."""
+        compiled = self._compiled.get(target)
+        if compiled is not None:
+            return compiled.predict(x)
+        booster = self._boosters.get(target)
+        if booster is not None:
+            return booster.inplace_predict(np.ascontiguousarray(x, dtype=np.float32))
+        return self._models[target].predict(x)
+
+    def _compiled_input(self, x: np.ndarray):
+        """Convert x to a tl2cgen.DMatrix once, to be shared by all targets."""
+        if not self._compiled:
+            return None
+        return tl2cgen.DMatrix(np.ascontiguousarray(x, dtype=np.float32))
+
+    def predict_multi(self, X) -> dict[str, np.ndarray]:
         """
-        Predict all 6 scores for a startup.
+        Raw predictions of every loaded target model, run concurrently.
 
-        Args:
-            row: dict with English keys (from CSV or DB row)
+        X is a feature matrix or an already built xgb.DMatrix. A matrix is
+        made float32/C-contiguous once and fed to Booster.inplace_predict,
+        which skips DMatrix construction; a DMatrix input always goes
+        through the XGBoost boosters.
+        """
+        if not self._loaded:
+            self._ensure_loaded()
+
+        submit = self._executor.submit
+        if isinstance(X, np.ndarray):
+            X = np.ascontiguousarray(X, dtype=np.float32)
+            tl_input = self._compiled_input(X)
+            futures = {
+                submit(run, tl_input if compiled else X): target
+                for target, run, compiled in self._runners
+            }
+        else:
+            futures = {
+                submit(_get_booster(self._models[target]).predict, X): target
+                for target, _, _ in self._runners
+            }
 
-        Returns:
-            {"overall": 7.2, "tech_maturity": 6.5, ...}
+        return {futures[fut]: fut.result() for fut in as_completed(futures)}
+
+    def _featurize(self, row: dict) -> np.ndarray:
         """
-        self._ensure_loaded()
+        Feature vector of `row` as a read-only (1, n_features) array.
 
+        Nothing is cached per row: callers that need both scores and SHAP
+        share one vector explicitly (predict_and_explain, explain_all).
+        """
         from scoring.features import extract_features
 
         x = extract_features(row).reshape(1, -1)
+        x.flags.writeable = False
+        return x
+
+    def _featurize_many(self, rows: list[dict]) -> np.ndarray:
+        """Feature matrix for `rows`, written row by row into one buffer."""
+        from scoring.features import extract_features, get_feature_names
+
+        X = np.empty((len(rows), len(get_feature_names())), dtype=np.float32)
+        for i, row in enumerate(rows):
+            X[i] = extract_features(row)
+        return X
+
+    def _scores_from_x(self, x: np.ndarray) -> dict[str, float]:
+        """All 6 clipped scores for a single (1, n_features) row."""
+        raw_preds = self.predict_multi(x)
 
         scores = {}
         for target in TARGET_NAMES:
-            if target in self._models:
-                raw = float(self._models[target].predict(x)[0])
+            if target in raw_preds:
+                raw = float(raw_preds[target][0])
                 scores[target] = round(max(1.0, min(10.0, raw)), 2)
             else:
                 scores[target] = 0.0
 
         return scores
 
+    def predict(self, row: dict) -> dict[str, float]:
+        """
+        Predict all 6 scores for a startup.
+
+        Args:
+            row: dict with English keys (from CSV or DB row)
+
+        Returns:
+            {"overall": 7.2, "tech_maturity": 6.5, ...}
+        """
+        if not self._loaded:
+            self._ensure_loaded()
+        return self._scores_from_x(self._featurize(row))
+
+    def predict_and_explain(
+        self, row: dict, target: str = "overall", top_n: int = 8,
+    ) -> tuple[dict[str, float], Optional[dict]]:
+        """
+        predict() + explain() for one startup, extracting features once.
+
+        SHAP failures yield None for the explanation so the scores are
+        still usable.
+        """
+        if not self._loaded:
+            self._ensure_loaded()
+
+        x = self._featurize(row)
+        scores = self._scores_from_x(x)
+        try:
+            explanation = self._explain_x(x, target, top_n, predicted=scores.get(target))
+        except Exception as e:
+            logger.debug("SHAP explanation failed for %s: %s", target, e)
+            explanation = None
+        return scores, explanation
+
     def predict_batch(self, rows: list[dict]) -> list[dict[str, float]]:
         """Predict scores for multiple startups at once (faster)."""
-        self._ensure_loaded()
+        if not self._loaded:
+            self._ensure_loaded()
 
-        from scoring.features import extract_features
+        return self._scores_from_matrix(self._featurize_many(rows))
 
-        X = np.vstack([extract_features(row).reshape(1, -1) for row in rows])
+    def _scores_from_matrix(self, X: np.ndarray) -> list[dict[str, float]]:
+        """Clipped scores per row of X (targets without a model are omitted)."""
+        raw_preds = self.predict_multi(X)
 
-        all_scores = [{} for _ in rows]
+        all_scores = [{} for _ in range(len(X))]
         for target in TARGET_NAMES:
-            if target in self._models:
-                preds = self._models[target].predict(X)
+            if target in raw_preds:
+                preds = raw_preds[target]
                 for i, raw in enumerate(preds):
                     all_scores[i][target] = round(float(max(1.0, min(10.0, raw))), 2)
 
         return all_scores
 
+    def predict_and_explain_batch(
+        self, rows: list[dict], target: str = "overall", top_n: int = 8,
+    ) -> tuple[list[dict[str, float]], list[Optional[dict]]]:
+        """
+        predict_batch() + explain_batch() on one feature matrix.
+
+        SHAP failures yield None explanations so the scores are still usable.
+        """
+        if not self._loaded:
+            self._ensure_loaded()
+
+        X = self._featurize_many(rows)
+        all_scores = self._scores_from_matrix(X)
+        try:
+            explanations = self._explain_matrix(
+                X, target, top_n, predicted=[s.get(target) for s in all_scores],
+            )
+        except Exception as e:
+            logger.debug("Batch SHAP explanation failed for %s: %s", target, e)
+            explanations = [None] * len(rows)
+        return all_scores, explanations
+
     # ------------------------------------------------------------------
     # SHAP explanations
     # ------------------------------------------------------------------
@@ -165,6 +540,24 @@ class StartupPredictor:
             logger.warning("Failed to create SHAP explainer for %s: %s", target, e)
             return None
 
+    def _shap_row(self, explainer, target: str, x: np.ndarray) -> np.ndarray:
+        """SHAP values of one (1, n) row, memoized on (target, feature bytes)."""
+        key = (target, x.tobytes())
+        with self._shap_cache_lock:
+            cached = self._shap_cache.get(key)
+            if cached is not None:
+                self._shap_cache.move_to_end(key)
+                return cached
+
+        shap_values = explainer.shap_values(x)[0]
+        shap_values.flags.writeable = False
+
+        with self._shap_cache_lock:
+            self._shap_cache[key] = shap_values
+            if len(self._shap_cache) > SHAP_CACHE_SIZE:
+                self._shap_cache.popitem(last=False)
+        return shap_values
+
     def explain(self, row: dict, target: str = "overall", top_n: int = 8) -> Optional[dict]:
         """
         Compute SHAP explanation for a single prediction.
@@ -185,48 +578,128 @@ class StartupPredictor:
                 "shap_values": [...]
             }
         """
-        self._ensure_loaded()
+        if not self._loaded:
+            self._ensure_loaded()
 
-        from scoring.features import extract_features
+        if self._get_explainer(target) is None:
+            return None
+        return self._explain_x(self._featurize(row), target, top_n)
 
+    def _explain_x(
+        self, x: np.ndarray, target: str, top_n: int, predicted: Optional[float] = None,
+    ) -> Optional[dict]:
+        """explain() for an already extracted (1, n_features) row."""
         explainer = self._get_explainer(target)
         if explainer is None:
             return None
 
-        x = extract_features(row).reshape(1, -1)
-        shap_values = explainer.shap_values(x)[0]
-        base_value = float(explainer.expected_value)
+        x = np.ascontiguousarray(x, dtype=np.float32)
 
-        feature_names = self._feature_names or [f"f{i}" for i in range(len(shap_values))]
+        shap_values = self._shap_row(explainer, target, x)
 
-        # Sort by absolute contribution
-        contributions = []
-        for i, (name, sv) in enumerate(zip(feature_names, shap_values)):
-            contributions.append({
-                "feature": name,
-                "contribution": round(float(sv), 4),
-                "value": round(float(x[0, i]), 4),
-            })
+        if predicted is None:
+            raw = float(self._predict_raw(target, x)[0])
+            predicted = round(max(1.0, min(10.0, raw)), 2)
 
-        contributions.sort(key=lambda c: abs(c["contribution"]), reverse=True)
+        return self._explanation(
+            shap_values, x[0], float(explainer.expected_value), predicted, top_n,
+        )
 
-        top_positive = [c for c in contributions if c["contribution"] > 0][:top_n]
-        top_negative = [c for c in contributions if c["contribution"] < 0][:top_n]
+    def explain_batch(
+        self, rows: list[dict], target: str = "overall", top_n: int = 3,
+    ) -> list[Optional[dict]]:
+        """
+        explain() for many startups: one shap_values() call over the whole
+        feature matrix instead of one per row.
+        """
+        if not self._loaded:
+            self._ensure_loaded()
+
+        if not rows or self._get_explainer(target) is None:
+            return [None] * len(rows)
+        return self._explain_matrix(self._featurize_many(rows), target, top_n)
+
+    def _explain_matrix(
+        self,
+        X: np.ndarray,
+        target: str,
+        top_n: int,
+        predicted: Optional[list] = None,
+    ) -> list[Optional[dict]]:
+        """explain_batch() for an already extracted (n_rows, n_features) matrix."""
+        explainer = self._get_explainer(target)
+        if explainer is None or len(X) == 0:
+            return [None] * len(X)
+
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        shap_matrix = explainer.shap_values(X)
+        base_value = float(explainer.expected_value)
 
-        predicted = float(self._models[target].predict(x)[0])
+        if predicted is None:
+            predicted = [
+                round(max(1.0, min(10.0, float(raw))), 2)
+                for raw in self._predict_raw(target, X)
+            ]
+
+        return [
+            self._explanation(shap_matrix[i], X[i], base_value, predicted[i], top_n)
+            for i in range(len(X))
+        ]
+
+    def _explanation(
+        self,
+        shap_values: np.ndarray,
+        x: np.ndarray,
+        base_value: float,
+        predicted: float,
+        top_n: int,
+    ) -> dict:
+        """Result dict of explain() from one row's SHAP values and features."""
+        # Only the top_n entries per sign are materialized; ranking uses the
+        # same 4-digit rounded contributions that end up in the result
+        n = min(len(self._feature_names_arr), len(shap_values))
+        rounded = np.array([round(sv, 4) for sv in shap_values[:n].tolist()])
+
+        def entries(idx):
+            return [
+                {"feature": name, "contribution": contribution, "value": round(value, 4)}
+                for name, contribution, value in zip(
+                    self._feature_names_arr[idx].tolist(),
+                    rounded[idx].tolist(),
+                    x[idx].tolist(),
+                )
+            ]
+
+        pos = np.flatnonzero(rounded > 0)
+        neg = np.flatnonzero(rounded < 0)
+        top_positive = entries(_top_by_magnitude(rounded[pos], pos, top_n))
+        top_negative = entries(_top_by_magnitude(-rounded[neg], neg, top_n))
 
         return {
-            "predicted_score": round(max(1.0, min(10.0, predicted)), 2),
+            "predicted_score": predicted,
             "base_value": round(base_value, 2),
             "top_positive": top_positive,
             "top_negative": top_negative,
         }
 
     def explain_all(self, row: dict, top_n: int = 5) -> dict[str, dict]:
-        """SHAP explanation for all 6 targets."""
+        """
+        SHAP explanation for all 6 targets.
+
+        One feature vector is shared by the six explainers, which run side
+        by side on the prediction pool (they are read-only once built).
+        """
+        if not self._loaded:
+            self._ensure_loaded()
+
+        x = self._featurize(row)
+        futures = {
+            target: self._executor.submit(self._explain_x, x, target, top_n)
+            for target in TARGET_NAMES
+        }
         results = {}
         for target in TARGET_NAMES:
-            exp = self.explain(row, target=target, top_n=top_n)
+            exp = futures[target].result()
             if exp:
                 results[target] = exp
         return results
@@ -239,6 +712,20 @@ class StartupPredictor:
 _predictor: Optional[StartupPredictor] = None
 _predictor_lock = Lock()
 
+# Every StartupPredictor, so forked children can reset their pools and locks
+_instances: "weakref.WeakSet[StartupPredictor]" = weakref.WeakSet()
+
+
+def _reinit_after_fork():
+    global _predictor_lock
+    _predictor_lock = Lock()
+    for predictor in list(_instances):
+        predictor._after_fork()
+
+
+if hasattr(os, "register_at_fork"):  # POSIX only
+    os.register_at_fork(after_in_child=_reinit_after_fork)
+
 
 def get_predictor(model_dir: Path | str | None = None) -> StartupPredictor:
     """Get or create the global predictor singleton."""
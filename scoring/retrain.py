@@ -28,9 +28,12 @@ from __future__ import annotations
 
 import argparse
 import datetime as dt
+import hashlib
 import json
 import logging
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
@@ -48,43 +51,167 @@ MIN_R2_THRESHOLD = 0.80
 # Допустимое падение R² по сравнению с baseline (оригинальная модель)
 MAX_R2_DROP = 0.05
 
+# Ранний отсев в generate_pseudo_labels: после PRUNE_BOOTSTRAP прогонов
+# сэмплы с confidence < порог - PRUNE_MARGIN выбывают из полного bootstrap.
+# По умолчанию выключен: предсказания и так батчевые (выигрыш ~10%), а std
+# отсеянных сэмплов по 3 прогонам сдвигает нормировку confidence (max std)
+# и для всех остальных.
+PRUNE_BOOTSTRAP = 0
+PRUNE_MARGIN = 0.2
+
+# Гиперпараметры XGBoost (как в scoring.train.train_xgboost)
+XGB_PARAMS = dict(
+    n_estimators=300,
+    max_depth=6,
+    learning_rate=0.05,
+    subsample=0.8,
+    colsample_bytree=0.8,
+    reg_alpha=0.1,
+    reg_lambda=1.0,
+    random_state=42,
+    n_jobs=-1,
+)
+
+# Лог дообучений: append-only JSONL (старый формат -- JSON-массив целиком)
+RETRAIN_LOG_NAME = "retrain_log.jsonl"
+LEGACY_RETRAIN_LOG_NAME = "retrain_log.json"
+
+# Early stopping: доля обучающей части Сколково под валидацию
+# и число раундов без улучшения RMSE до остановки
+EARLY_STOPPING_VAL_SIZE = 0.15
+EARLY_STOPPING_ROUNDS = 20
+
+# Сколько таргетов обучать одновременно. Потоки XGBoost делятся между ними:
+# несколько моделей с частью ядер быстрее, чем по одной на всех ядрах.
+FIT_WORKERS = 3
+
+# Финальный шаг: модель шага 5 дообучается (warm start) на строках Сколково,
+# которых она не видела (early-stopping валидация + hold-out), вместо
+# обучения всех деревьев с нуля на полных данных
+WARM_START_ROUNDS = 50
+WARM_START_LR = 0.03
+
+
+_TARGET_NAMES = ["overall", "tech_maturity", "innovation", "market_potential",
+                 "team_readiness", "financial_health"]
+
+
+def _skolkovo_cache_path(csv_path: Path) -> Path:
+    """
+    Путь к .npz-кэшу признаков/меток Сколково рядом с CSV.
+
+    Ключ -- mtime и размер CSV, skolkovo_bfo.json и кода признаков/меток:
+    любое их изменение даёт новый файл кэша.
+    """
+    sources = [
+        csv_path,
+        ROOT / "skolkovo_bfo.json",
+        ROOT / "scoring" / "features.py",
+        ROOT / "scoring" / "bfo_ratios.py",
+        ROOT / "scoring" / "labeler.py",
+    ]
+    parts = []
+    for path in sources:
+        if path.exists():
+            st = path.stat()
+            parts.append(f"{path.name}:{st.st_mtime_ns}:{st.st_size}")
+    key = hashlib.md5("|".join(parts).encode()).hexdigest()[:12]
+    return csv_path.with_name(f"{csv_path.stem}.features-{key}.npz")
+
+
+def _load_skolkovo_cache(cache_path: Path):
+    """Чтение кэша; None, если его нет или он не читается."""
+    if not cache_path.exists():
+        return None
+    try:
+        with np.load(cache_path) as data:
+            X = data["X"]
+            targets = {t: data[f"y_{t}"] for t in _TARGET_NAMES}
+            ids = data["ids"].tolist()
+            feat_names = data["feat_names"].tolist()
+    except Exception as e:
+        logger.warning("Кэш Сколково %s не прочитан: %s", cache_path, e)
+        return None
+    return X, targets, ids, feat_names
+
+
+def _save_skolkovo_cache(cache_path: Path, X, targets, ids, feat_names):
+    """Запись кэша через временный файл; устаревшие кэши этого CSV удаляются."""
+    tmp_path = cache_path.with_name(f"{cache_path.stem}.{os.getpid()}.tmp.npz")
+    try:
+        np.savez(
+            tmp_path, X=X, ids=np.array(ids), feat_names=np.array(feat_names),
+            **{f"y_{t}": targets[t] for t in _TARGET_NAMES},
+        )
+        os.replace(tmp_path, cache_path)
+    except Exception as e:
+        logger.warning("Не удалось сохранить кэш Сколково %s: %s", cache_path, e)
+        tmp_path.unlink(missing_ok=True)
+        return
+
+    stem = cache_path.stem.rsplit(".features-", 1)[0]
+    for stale in cache_path.parent.glob(f"{stem}.features-*.npz"):
+        if stale != cache_path:
+            stale.unlink(missing_ok=True)
+
 
-def load_skolkovo_data(csv_path: str | Path) -> Tuple[np.ndarray, np.ndarray, list, list]:
+def load_skolkovo_data(
+    csv_path: str | Path,
+    use_cache: bool = True,
+) -> Tuple[np.ndarray, np.ndarray, list, list]:
     """
     Загрузка Сколково (ground truth).
 
+    Результат кэшируется в .npz рядом с CSV (см. _skolkovo_cache_path),
+    повторные запуски не парсят CSV и не пересчитывают признаки.
+
+    Args:
+        csv_path: путь к SkolkovoStartups.csv
+        use_cache: читать/писать .npz-кэш
+
     Returns:
-        X_sk      -- (N, 39) матрица признаков
+        X_sk      -- (N, D) матрица признаков
         y_sk      -- dict target_name -> (N,) массив меток
         ids_sk    -- список id стартапов
-        feat_names -- список из 39 названий признаков
+        feat_names -- список из D названий признаков
     """
+    csv_path = Path(csv_path)
+    if use_cache:
+        cache_path = _skolkovo_cache_path(csv_path)
+        cached = _load_skolkovo_cache(cache_path)
+        if cached is not None:
+            logger.info("Сколково загружено из кэша %s", cache_path.name)
+            return cached
+
     from scoring.features import build_feature_matrix, get_feature_names
     from scoring.labeler import label_dataframe
 
     X, feat_names, ids, y_overall = build_feature_matrix(csv_path)
 
-    labels_df = label_dataframe(csv_path)
-    label_map = {r["id"]: r for _, r in labels_df.iterrows()}
+    # Дубликаты id: побеждает последняя строка (как раньше в dict-е)
+    labels_df = (
+        label_dataframe(csv_path)
+        .drop_duplicates("id", keep="last")
+        .set_index("id")
+    )
 
     targets = {"overall": y_overall}
 
-    for target_name in ["tech_maturity", "innovation", "market_potential",
-                        "team_readiness", "financial_health"]:
+    for target_name in _TARGET_NAMES[1:]:
         col = f"score_{target_name}"
-        y_target = np.array([
-            float(label_map.get(sid, {}).get(col, 3.0))
-            if sid in label_map and len(label_map[sid]) > 0 else 3.0
-            for sid in ids
-        ], dtype=np.float32)
-        targets[target_name] = y_target
+        targets[target_name] = (
+            labels_df[col].reindex(ids, fill_value=3.0).to_numpy(dtype=np.float32)
+        )
+
+    if use_cache:
+        _save_skolkovo_cache(cache_path, X, targets, ids, feat_names)
 
     return X, targets, ids, feat_names
 
 
 def extract_external_features(external_startups: List[Dict]) -> Tuple[np.ndarray, List[str]]:
     """
-    Извлечение 39 признаков для внешних стартапов.
+    Извлечение признаков (см. features.get_feature_names) для внешних стартапов.
 
     Args:
         external_startups: список dict-ов с данными парсеров
@@ -95,33 +222,82 @@ def extract_external_features(external_startups: List[Dict]) -> Tuple[np.ndarray
             - и прочие поля, если доступны
 
     Returns:
-        X_ext   -- (M, 39)
+        X_ext   -- (M, n_features) float32
         ids_ext -- список ИНН (как идентификатор)
     """
-    from scoring.features import extract_features
+    from scoring.features import extract_features, get_feature_names
 
-    X_list = []
+    # Матрица выделяется один раз, строки пишутся на место -- без списка
+    # массивов и финального vstack. Неудачные строки отбрасываются маской.
+    n = len(external_startups)
+    X = np.empty((n, len(get_feature_names())), dtype=np.float32)
+    ok = np.ones(n, dtype=bool)
     ids = []
 
-    for startup in external_startups:
+    for i, startup in enumerate(external_startups):
         try:
-            feats = extract_features(startup)
-            X_list.append(feats)
+            X[i] = extract_features(startup)
             ids.append(startup.get("inn", startup.get("name", "unknown")))
         except Exception as e:
+            ok[i] = False
             logger.warning("Не удалось извлечь признаки для %s: %s",
                            startup.get("name", "?"), e)
 
-    if not X_list:
-        return np.empty((0, 39), dtype=np.float32), []
+    if len(ids) < n:
+        X = X[ok]
+    return X, ids
+
+
+def _batch_booster(model):
+    """
+    Копия XGBoost-бустера модели предиктора для пакетных predict на всех ядрах.
+
+    Предиктор закрепляет свои бустеры за одним потоком (_pin_single_thread:
+    шесть моделей идут параллельно по одной строке). Псевдо-метки и
+    baseline гоняют predict по тысячам строк -- им нужен nthread по числу
+    ядер, но менять параметры общего бустера нельзя (его же использует
+    сервинг), поэтому работаем с копией.
+
+    None -- модель не XGBoost (ConstantRegressor для почти константной
+    цели, ансамбль, LightGBM): её предсказываем обычным model.predict().
+    """
+    if not hasattr(model, "get_booster"):
+        return None
+    booster = model.get_booster().copy()
+    booster.set_param({"nthread": os.cpu_count() or 1})
+    return booster
 
-    return np.vstack(X_list), ids
+
+def _mean_std_rows(preds: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Построчные среднее и std матрицы (M, B); preds портится (in place).
+
+    std переиспользует среднее -- те же операции, что у np.std,
+    который посчитал бы среднее ещё раз.
+    """
+    mean = preds.mean(axis=1)
+    preds -= mean[:, None]
+    np.multiply(preds, preds, out=preds)
+    return mean, np.sqrt(preds.sum(axis=1) / preds.shape[1])
+
+
+def _normalized_confidence(stds: np.ndarray) -> np.ndarray:
+    """confidence = 1 - std / max(std) по сэмплам, std -- (M, n_targets)."""
+    all_stds = stds.mean(axis=1)
+
+    max_std = float(all_stds.max()) if len(all_stds) else 1.0
+    if max_std == 0:
+        max_std = 1.0
+
+    return np.clip((1.0 - all_stds / max_std).astype(np.float32), 0.0, 1.0)
 
 
 def generate_pseudo_labels(
     X_ext: np.ndarray,
     confidence_threshold: float = 0.8,
     n_bootstrap: int = 10,
+    n_prune_bootstrap: int = PRUNE_BOOTSTRAP,
+    predictor=None,
 ) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
     """
     Генерация псевдо-меток для внешних стартапов.
@@ -131,61 +307,121 @@ def generate_pseudo_labels(
     - Считаем среднее (= pseudo-label) и стандартное отклонение (= uncertainty)
     - confidence = 1 - normalized_std
 
+    Ранний отсев: первые n_prune_bootstrap прогонов делаются для всех
+    сэмплов; сэмплы, чья предварительная confidence ниже
+    confidence_threshold - PRUNE_MARGIN, дальше не считаются -- их метки
+    и std берутся по этим первым прогонам (всё равно не пройдут порог).
+    n_prune_bootstrap=0 -- без отсева.
+
+    predictor -- уже загруженный StartupPredictor (по умолчанию синглтон
+    get_predictor()).
+
     Returns:
         pseudo_labels  -- dict target_name -> (M,) массив псевдо-меток
         confidence     -- (M,) массив confidence [0, 1]
     """
-    from scoring.predictor import get_predictor
+    import xgboost as xgb
 
-    predictor = get_predictor()
+    if predictor is None:
+        from scoring.predictor import get_predictor
+        predictor = get_predictor()
+    # is_ready загружает модели при первом обращении
     if not predictor.is_ready:
         raise RuntimeError("ML модели не загружены. Сначала обучите на Сколково данных.")
 
-    predictor._ensure_loaded()
-
     target_names = ["overall", "tech_maturity", "innovation",
                     "market_potential", "team_readiness", "financial_health"]
+    boosters = {}
+    # Модели без бустера: одно предсказание на все bootstrap-прогоны (std = 0)
+    plain = {}
+    for t in target_names:
+        if t in predictor._models:
+            booster = _batch_booster(predictor._models[t])
+            if booster is not None:
+                boosters[t] = booster
+            else:
+                plain[t] = predictor._models[t]
+
+    # One DMatrix shared by every (target, bootstrap) predict below
+    dmat = xgb.DMatrix(X_ext)
+
+    # Bootstrap tree fractions, drawn once for all targets. The per-b
+    # RandomState(42 + b) streams give the same values the old global
+    # np.random.seed(42 + b) draws did, without touching the global RNG.
+    fractions = [
+        np.random.RandomState(42 + b).uniform(0.7, 1.0) for b in range(n_bootstrap)
+    ]
+
+    n_samples = X_ext.shape[0]
+
+    # One predict over all samples per tree subset; (M, n_bootstrap) per
+    # target keeps the per-sample mean/std reductions contiguous
+    preds = {t: np.empty((n_samples, n_bootstrap)) for t in boosters}
+    for t, model in plain.items():
+        preds[t] = np.repeat(
+            np.clip(np.asarray(model.predict(X_ext), dtype=np.float64), 1.0, 10.0)[:, None],
+            n_bootstrap, axis=1,
+        )
 
-    pseudo_labels = {t: [] for t in target_names}
-    all_stds = []
-
-    for i in range(X_ext.shape[0]):
-        x = X_ext[i:i+1]
-        bootstrap_preds = {t: [] for t in target_names}
-
-        for target in target_names:
-            model = predictor._models.get(target)
-            if model is None:
-                bootstrap_preds[target] = [3.0] * n_bootstrap
-                continue
-
-            n_trees = model.get_booster().num_boosted_rounds()
-            for b in range(n_bootstrap):
-                np.random.seed(42 + b)
-                tree_subset = max(1, int(n_trees * np.random.uniform(0.7, 1.0)))
-                raw = float(model.predict(x, iteration_range=(0, tree_subset))[0])
-                bootstrap_preds[target].append(max(1.0, min(10.0, raw)))
-
-        stds = []
-        for target in target_names:
-            preds = bootstrap_preds[target]
-            mean_pred = np.mean(preds)
-            std_pred = np.std(preds)
-            pseudo_labels[target].append(mean_pred)
-            stds.append(std_pred)
-
-        avg_std = np.mean(stds)
-        all_stds.append(avg_std)
-
-    max_std = max(all_stds) if all_stds else 1.0
-    if max_std == 0:
-        max_std = 1.0
-
-    confidence = np.array([1.0 - (s / max_std) for s in all_stds], dtype=np.float32)
-    confidence = np.clip(confidence, 0.0, 1.0)
+    def run_bootstraps(bootstraps, dm, rows=slice(None)):
+        for t, booster in boosters.items():
+            n_trees = booster.num_boosted_rounds()
+            for b in bootstraps:
+                tree_subset = max(1, int(n_trees * fractions[b]))
+                preds[t][rows, b] = booster.predict(dm, iteration_range=(0, tree_subset))
+
+    n_first = n_bootstrap
+    if 0 < n_prune_bootstrap < n_bootstrap:
+        n_first = n_prune_bootstrap
+    run_bootstraps(range(n_first), dmat)
+    for p in preds.values():
+        np.clip(p[:, :n_first], 1.0, 10.0, out=p[:, :n_first])
+
+    keep = np.arange(n_samples)
+    if n_first < n_bootstrap and n_samples:
+        fast_stds = np.zeros((n_samples, len(target_names)))
+        for k, t in enumerate(target_names):
+            if t in preds:
+                fast_stds[:, k] = _mean_std_rows(preds[t][:, :n_first].copy())[1]
+        fast_conf = _normalized_confidence(fast_stds)
+        keep = np.flatnonzero(fast_conf >= confidence_threshold - PRUNE_MARGIN)
+        logger.info("Ранний отсев: %d из %d сэмплов на полный bootstrap",
+                    len(keep), n_samples)
+
+        if len(keep):
+            rest = range(n_first, n_bootstrap)
+            if len(keep) == n_samples:
+                run_bootstraps(rest, dmat)
+            else:
+                run_bootstraps(rest, xgb.DMatrix(X_ext[keep]), rows=keep)
+            for p in preds.values():
+                np.clip(p[:, n_first:], 1.0, 10.0, out=p[:, n_first:])
+
+    pruned = np.setdiff1d(np.arange(n_samples), keep, assume_unique=True)
+
+    pseudo_labels = {}
+    # (M, n_targets): per-sample bootstrap std of every target
+    stds = np.zeros((n_samples, len(target_names)))
+
+    for k, target in enumerate(target_names):
+        if target not in preds:
+            pseudo_labels[target] = np.full(n_samples, 3.0)
+            continue
+
+        p = preds[target]
+        if not len(pruned):
+            pseudo_labels[target], stds[:, k] = _mean_std_rows(p)
+            continue
+
+        mean = np.empty(n_samples)
+        mean[keep], stds[keep, k] = _mean_std_rows(p[keep])
+        mean[pruned], stds[pruned, k] = _mean_std_rows(p[pruned, :n_first])
+        pseudo_labels[target] = mean
+
+    confidence = _normalized_confidence(stds)
 
     for t in target_names:
-        pseudo_labels[t] = np.array(pseudo_labels[t], dtype=np.float32)
+        pseudo_labels[t] = pseudo_labels[t].astype(np.float32)
 
     return pseudo_labels, confidence
 
@@ -207,17 +443,162 @@ def compute_sample_weights(
     Returns:
         weights -- (n_skolkovo + n_external,)
     """
-    sk_weights = np.full(n_skolkovo, skolkovo_weight, dtype=np.float32)
+    # Один буфер на все веса: внешние считаются прямо в его хвосте
+    weights = np.empty(n_skolkovo + n_external, dtype=np.float32)
+    weights[:n_skolkovo] = skolkovo_weight
 
-    ext_weights = np.full(n_external, external_base_weight, dtype=np.float32)
+    ext_weights = weights[n_skolkovo:]
+    ext_weights[:] = external_base_weight
     ext_weights *= confidence
 
     if source_reliability is not None:
         ext_weights *= source_reliability
 
-    ext_weights = np.clip(ext_weights, 0.1, 0.7)
+    np.clip(ext_weights, 0.1, 0.7, out=ext_weights)
+
+    return weights
+
+
+def _gather_rows(src: np.ndarray, idx: np.ndarray, tail: np.ndarray) -> np.ndarray:
+    """
+    Строки src[idx] и под ними tail -- в одном заранее выделенном буфере.
 
-    return np.concatenate([sk_weights, ext_weights])
+    Заменяет np.vstack([src[idx], tail]): без промежуточной копии src[idx].
+    """
+    n = len(idx)
+    out = np.empty((n + len(tail),) + src.shape[1:],
+                   dtype=np.result_type(src, tail))
+    np.take(src, idx, axis=0, out=out[:n])
+    out[n:] = tail
+    return out
+
+
+def _regression_metrics(y_true: np.ndarray, y_pred: np.ndarray) -> Tuple[float, float]:
+    """
+    (R², MAE) за один проход по остаткам.
+
+    То же, что r2_score + mean_absolute_error из sklearn (включая R² = 1/0
+    при константном y_true), но без их валидации входа и повторных
+    проходов по массивам. Считается в float64.
+    """
+    y_true = np.asarray(y_true, dtype=np.float64)
+    diff = np.asarray(y_pred, dtype=np.float64) - y_true
+    mae = float(np.abs(diff).mean())
+    ss_res = float(np.dot(diff, diff))
+
+    centered = y_true - y_true.mean()
+    ss_tot = float(np.dot(centered, centered))
+    if ss_tot == 0:
+        r2 = 1.0 if ss_res == 0 else 0.0
+    else:
+        r2 = 1.0 - ss_res / ss_tot
+    return r2, mae
+
+
+def _fit_target(
+    X: np.ndarray,
+    y: np.ndarray,
+    sample_weight: Optional[np.ndarray],
+    n_jobs: int,
+    eval_set: Optional[list] = None,
+    xgb_model=None,
+    **overrides,
+):
+    """
+    Обучение одной XGBoost-модели.
+
+    eval_set включает early stopping, xgb_model -- дообучение поверх
+    существующего бустера; overrides заменяют значения из XGB_PARAMS.
+    """
+    import xgboost as xgb
+
+    params = dict(XGB_PARAMS, n_jobs=n_jobs, **overrides)
+    if eval_set is not None:
+        params.update(early_stopping_rounds=EARLY_STOPPING_ROUNDS, eval_metric="rmse")
+
+    model = xgb.XGBRegressor(**params)
+    model.fit(X, y, sample_weight=sample_weight, eval_set=eval_set,
+              xgb_model=xgb_model, verbose=False)
+    return model
+
+
+def _train_booster(
+    dtrain_ref,
+    X: np.ndarray,
+    y: np.ndarray,
+    sample_weight: np.ndarray,
+    X_val: np.ndarray,
+    y_val: np.ndarray,
+    n_jobs: int,
+    device: str = "cpu",
+):
+    """
+    Обучение бустера с early stopping через нативный xgb.train.
+
+    Квантильные границы бинов берутся из dtrain_ref -- общей для всех
+    таргетов QuantileDMatrix (метки у таргетов разные, признаки и веса
+    одни), так что скетч признаков считается один раз, а не на каждый fit.
+    Параметры те же, что у XGBRegressor(**XGB_PARAMS).
+    """
+    import xgboost as xgb
+
+    params = dict(XGB_PARAMS)
+    num_boost_round = params.pop("n_estimators")
+    params.pop("n_jobs")
+    params.update(
+        seed=params.pop("random_state"),
+        nthread=n_jobs,
+        device=device,
+        objective="reg:squarederror",
+        eval_metric="rmse",
+    )
+
+    dtrain = xgb.QuantileDMatrix(X, label=y, weight=sample_weight,
+                                 ref=dtrain_ref, nthread=n_jobs)
+    dval = xgb.QuantileDMatrix(X_val, label=y_val, ref=dtrain, nthread=n_jobs)
+    return xgb.train(
+        params, dtrain,
+        num_boost_round=num_boost_round,
+        evals=[(dval, "validation_0")],
+        early_stopping_rounds=EARLY_STOPPING_ROUNDS,
+        verbose_eval=False,
+    )
+
+
+def _fit_targets(
+    fit_kwargs: Dict[str, Dict],
+    workers: int = FIT_WORKERS,
+    fit_fn=_fit_target,
+    device: str = "cpu",
+) -> Dict:
+    """
+    Обучение моделей по таргетам параллельно в потоках.
+
+    XGBoost отпускает GIL во время fit, поэтому потоки реально работают
+    одновременно, а матрицы признаков не копируются между процессами.
+    Ядра делятся поровну между одновременными моделями.
+
+    Args:
+        fit_kwargs: target -> аргументы fit_fn (без n_jobs)
+        workers: максимум одновременно обучаемых моделей
+        fit_fn: _fit_target (XGBRegressor) или _train_booster (Booster)
+        device: "cpu" или "cuda" (см. scoring.train.xgb_training_device)
+    """
+    n_cpu = os.cpu_count() or 1
+    workers = max(1, min(workers, len(fit_kwargs), n_cpu))
+    n_jobs = max(1, n_cpu // workers)
+    if workers == 1:
+        return {
+            t: fit_fn(n_jobs=n_jobs, device=device, **kw)
+            for t, kw in fit_kwargs.items()
+        }
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            t: pool.submit(fit_fn, n_jobs=n_jobs, device=device, **kw)
+            for t, kw in fit_kwargs.items()
+        }
+        return {t: f.result() for t, f in futures.items()}
 
 
 def retrain_with_external(
@@ -227,6 +608,8 @@ def retrain_with_external(
     min_external: int = 10,
     model_dir: Optional[Path] = None,
     dry_run: bool = False,
+    fit_workers: int = FIT_WORKERS,
+    device: Optional[str] = None,
 ) -> Dict:
     """
     Основная функция дообучения.
@@ -238,6 +621,10 @@ def retrain_with_external(
         min_external: минимум внешних стартапов для запуска
         model_dir: директория для сохранения моделей
         dry_run: если True -- не сохраняем, только считаем метрики
+        fit_workers: сколько таргетов обучать одновременно
+            (1 -- последовательно, меньше пиковой памяти)
+        device: "cpu" / "cuda" для обучения XGBoost;
+            None -- CUDA, если доступна (см. scoring.train.xgb_training_device)
 
     Returns:
         dict с результатами:
@@ -251,10 +638,19 @@ def retrain_with_external(
     """
     import xgboost as xgb
     from sklearn.model_selection import train_test_split
-    from sklearn.metrics import mean_absolute_error, r2_score
 
     if model_dir is None:
         model_dir = ROOT / "scoring" / "models"
+    # Предиктор (текущие модели) загружается один раз: он нужен и для
+    # псевдо-меток (шаг 3), и для baseline-метрик (шаг 4)
+    from scoring.predictor import get_predictor
+    predictor = get_predictor()
+    predictor._ensure_loaded()
+
+    if device is None:
+        from scoring.train import xgb_training_device
+        device = xgb_training_device()
+    logger.info("XGBoost обучается на %s", device)
 
     result = {
         "timestamp": dt.datetime.now().isoformat(),
@@ -290,7 +686,9 @@ def retrain_with_external(
 
     # --- 3. Генерация псевдо-меток ---
     logger.info("=== Шаг 3: Генерация псевдо-меток (bootstrap) ===")
-    pseudo_labels, confidence = generate_pseudo_labels(X_ext, confidence_threshold)
+    pseudo_labels, confidence = generate_pseudo_labels(
+        X_ext, confidence_threshold, predictor=predictor
+    )
 
     confident_mask = confidence >= confidence_threshold
     n_confident = int(confident_mask.sum())
@@ -315,22 +713,27 @@ def retrain_with_external(
     # --- 4. Baseline метрики (текущие модели на hold-out Сколково) ---
     logger.info("=== Шаг 4: Baseline метрики ===")
 
-    X_sk_train, X_sk_test, idx_train, idx_test = train_test_split(
-        X_sk, np.arange(X_sk.shape[0]),
-        test_size=0.2, random_state=42
+    # Делим только индексы (то же разбиение, что и по самой матрице):
+    # строки потом собираются сразу в нужные буферы без промежуточных копий
+    idx_train, idx_test = train_test_split(
+        np.arange(X_sk.shape[0]), test_size=0.2, random_state=42
     )
-
-    from scoring.predictor import get_predictor
-    predictor = get_predictor()
-    predictor._ensure_loaded()
+    # Один DMatrix и одни метки hold-out для baseline (шаг 4)
+    # и новых моделей (шаг 6)
+    dtest = xgb.DMatrix(X_sk[idx_test])
+    y_test_sk = {t: y[idx_test] for t, y in targets_sk.items()}
 
     for target_name in targets_sk:
-        y_test = targets_sk[target_name][idx_test]
+        y_test = y_test_sk[target_name]
         if target_name in predictor._models:
-            y_pred = predictor._models[target_name].predict(X_sk_test)
+            model = predictor._models[target_name]
+            booster = _batch_booster(model)
+            if booster is not None:
+                y_pred = booster.predict(dtest)
+            else:
+                y_pred = np.asarray(model.predict(X_sk[idx_test]))
             y_pred = np.clip(y_pred, 1.0, 10.0)
-            baseline_r2 = float(r2_score(y_test, y_pred))
-            baseline_mae = float(mean_absolute_error(y_test, y_pred))
+            baseline_r2, baseline_mae = _regression_metrics(y_test, y_pred)
         else:
             baseline_r2 = 0.0
             baseline_mae = 999.0
@@ -344,44 +747,64 @@ def retrain_with_external(
     # --- 5. Объединение данных и дообучение ---
     logger.info("=== Шаг 5: Дообучение (Skolkovo + %d внешних) ===", n_confident)
 
-    X_combined_train = np.vstack([X_sk_train, X_ext_conf])
+    # Early-stopping валидация вырезается из train-части Сколково,
+    # hold-out (idx_test) остаётся нетронутым для шага 6
+    idx_fit, idx_val = train_test_split(
+        idx_train, test_size=EARLY_STOPPING_VAL_SIZE, random_state=42
+    )
+    X_val = X_sk[idx_val]
+
+    X_combined_train = _gather_rows(X_sk, idx_fit, X_ext_conf)
     sample_weights = compute_sample_weights(
-        n_skolkovo=X_sk_train.shape[0],
+        n_skolkovo=len(idx_fit),
         n_external=X_ext_conf.shape[0],
         confidence=confidence_conf,
     )
 
-    new_models = {}
-    for target_name in targets_sk:
-        y_sk_train = targets_sk[target_name][idx_train]
-        y_ext_conf = pseudo_labels[target_name][confident_mask]
-        y_combined = np.concatenate([y_sk_train, y_ext_conf])
-
-        model = xgb.XGBRegressor(
-            n_estimators=300,
-            max_depth=6,
-            learning_rate=0.05,
-            subsample=0.8,
-            colsample_bytree=0.8,
-            reg_alpha=0.1,
-            reg_lambda=1.0,
-            random_state=42,
-            n_jobs=-1,
+    X_train_in, X_val_in = X_combined_train, X_val
+    if device == "cuda":
+        # Матрицы загружаются на GPU один раз для всех таргетов
+        try:
+            import cupy
+            X_train_in, X_val_in = cupy.asarray(X_combined_train), cupy.asarray(X_val)
+        except ImportError:
+            pass
+
+    # Общие квантили признаков для всех таргетов (см. _train_booster)
+    dtrain_ref = xgb.QuantileDMatrix(X_train_in, weight=sample_weights)
+
+    y_ext = {t: pseudo_labels[t][confident_mask] for t in targets_sk}
+    new_models = _fit_targets({
+        target_name: dict(
+            dtrain_ref=dtrain_ref,
+            X=X_train_in,
+            y=_gather_rows(targets_sk[target_name], idx_fit, y_ext[target_name]),
+            sample_weight=sample_weights,
+            X_val=X_val_in,
+            y_val=targets_sk[target_name][idx_val],
         )
-        model.fit(X_combined_train, y_combined, sample_weight=sample_weights, verbose=False)
-        new_models[target_name] = model
+        for target_name in targets_sk
+    }, workers=fit_workers, fit_fn=_train_booster, device=device)
+    del dtrain_ref
+
+    best_rounds = {}
+    for target_name, booster in new_models.items():
+        best_rounds[target_name] = int(booster.best_iteration) + 1
+        logger.info("  %s: %d деревьев (early stopping)",
+                    target_name, best_rounds[target_name])
 
     # --- 6. Валидация на held-out Сколково ---
     logger.info("=== Шаг 6: Валидация на held-out Сколково ===")
     rollback_needed = False
 
     for target_name in targets_sk:
-        y_test = targets_sk[target_name][idx_test]
-        y_pred = new_models[target_name].predict(X_sk_test)
+        y_test = y_test_sk[target_name]
+        y_pred = new_models[target_name].predict(
+            dtest, iteration_range=(0, best_rounds[target_name])
+        )
         y_pred = np.clip(y_pred, 1.0, 10.0)
 
-        new_r2 = float(r2_score(y_test, y_pred))
-        new_mae = float(mean_absolute_error(y_test, y_pred))
+        new_r2, new_mae = _regression_metrics(y_test, y_pred)
 
         result["metrics_after"][target_name] = {
             "r2": round(new_r2, 4),
@@ -410,6 +833,8 @@ def retrain_with_external(
             )
             rollback_needed = True
 
+    del dtest
+
     if rollback_needed:
         result["status"] = "rollback"
         result["reason"] = (
@@ -419,46 +844,40 @@ def retrain_with_external(
         logger.warning(result["reason"])
         return result
 
-    # --- 7. Если всё ок -- дообучаем на ПОЛНЫХ данных и сохраняем ---
+    # --- 7. Если всё ок -- доучиваем на оставшихся данных и сохраняем ---
     if dry_run:
         result["status"] = "dry_run"
         result["reason"] = "Dry run: модели не сохранены, метрики рассчитаны."
         logger.info(result["reason"])
         return result
 
-    logger.info("=== Шаг 7: Финальное обучение на полных данных ===")
-    X_full = np.vstack([X_sk, X_ext_conf])
-    full_weights = compute_sample_weights(
-        n_skolkovo=X_sk.shape[0],
-        n_external=X_ext_conf.shape[0],
-        confidence=confidence_conf,
-    )
+    logger.info("=== Шаг 7: Дообучение на отложенных строках Сколково ===")
+    idx_rest = np.concatenate([idx_val, idx_test])
+    X_rest = X_sk[idx_rest]
+    rest_weights = np.ones(len(idx_rest), dtype=np.float32)
 
     from scoring.train import save_model as _save, feature_importance_report
 
-    for target_name in targets_sk:
-        y_sk_full = targets_sk[target_name]
-        y_ext_conf = pseudo_labels[target_name][confident_mask]
-        y_full = np.concatenate([y_sk_full, y_ext_conf])
-
-        final_model = xgb.XGBRegressor(
-            n_estimators=300,
-            max_depth=6,
-            learning_rate=0.05,
-            subsample=0.8,
-            colsample_bytree=0.8,
-            reg_alpha=0.1,
-            reg_lambda=1.0,
-            random_state=42,
-            n_jobs=-1,
+    # Продолжаем бустеры шага 5, обрезанные до лучшей итерации
+    final_models = _fit_targets({
+        target_name: dict(
+            X=X_rest,
+            y=targets_sk[target_name][idx_rest],
+            sample_weight=rest_weights,
+            xgb_model=new_models[target_name][:best_rounds[target_name]],
+            n_estimators=WARM_START_ROUNDS,
+            learning_rate=WARM_START_LR,
         )
-        final_model.fit(X_full, y_full, sample_weight=full_weights, verbose=False)
+        for target_name in targets_sk
+    }, workers=fit_workers, device=device)
 
+    for target_name, final_model in final_models.items():
         importance = feature_importance_report(final_model, feat_names)
         cv_metrics = result["metrics_after"][target_name]
-        cv_metrics["n_samples"] = int(X_full.shape[0])
+        cv_metrics["n_samples"] = int(X_sk.shape[0] + X_ext_conf.shape[0])
         cv_metrics["n_skolkovo"] = int(X_sk.shape[0])
         cv_metrics["n_external"] = int(X_ext_conf.shape[0])
+        cv_metrics["n_estimators"] = final_model.get_booster().num_boosted_rounds()
 
         target_dir = model_dir / target_name
         _save(
@@ -468,18 +887,7 @@ def retrain_with_external(
         logger.info("  Модель '%s' сохранена в %s", target_name, target_dir)
 
     # Сохраняем лог дообучения
-    retrain_log_path = model_dir / "retrain_log.json"
-    logs = []
-    if retrain_log_path.exists():
-        try:
-            logs = json.loads(retrain_log_path.read_text(encoding="utf-8"))
-        except Exception:
-            logs = []
-    logs.append(result)
-    retrain_log_path.write_text(
-        json.dumps(logs, indent=2, ensure_ascii=False),
-        encoding="utf-8"
-    )
+    _append_retrain_log(model_dir, result)
 
     result["status"] = "success"
     result["reason"] = (
@@ -491,6 +899,71 @@ def retrain_with_external(
     return result
 
 
+def _append_retrain_log(model_dir: Path, entry: Dict) -> None:
+    """Дописать запись в retrain_log.jsonl (одна JSON-строка на запуск)."""
+    log_path = model_dir / RETRAIN_LOG_NAME
+    with log_path.open("a", encoding="utf-8") as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+def read_retrain_log(model_dir: Optional[Path] = None) -> List[Dict]:
+    """
+    История дообучений: записи старого retrain_log.json (JSON-массив),
+    если он есть, затем записи retrain_log.jsonl.
+    """
+    if model_dir is None:
+        model_dir = ROOT / "scoring" / "models"
+
+    logs = []
+    legacy_path = model_dir / LEGACY_RETRAIN_LOG_NAME
+    if legacy_path.exists():
+        try:
+            logs.extend(json.loads(legacy_path.read_text(encoding="utf-8")))
+        except Exception as e:
+            logger.warning("Не удалось прочитать %s: %s", legacy_path, e)
+
+    log_path = model_dir / RETRAIN_LOG_NAME
+    if log_path.exists():
+        with log_path.open(encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    logs.append(json.loads(line))
+                except ValueError:
+                    # Недописанная строка (процесс прерван на записи)
+                    logger.warning("Пропущена битая строка в %s", log_path)
+    return logs
+
+
+_EXTERNAL_DB_COLUMNS = ("inn", "name", "full_legal_name", "registration_date",
+                        "status_egrul", "region", "features_json")
+
+
+def _parse_features_json(blobs: List) -> List:
+    """
+    json.loads для списка features_json.
+
+    Все строки разбираются одним вызовом как JSON-массив; если хоть одна
+    битая -- откат на построчный разбор, где битая строка даёт {}.
+    """
+    if all(isinstance(b, str) and b.strip() for b in blobs):
+        try:
+            parsed = json.loads("[" + ",".join(blobs) + "]")
+            if len(parsed) == len(blobs):
+                return parsed
+        except ValueError:
+            pass
+
+    parsed = []
+    for b in blobs:
+        try:
+            parsed.append(json.loads(b))
+        except Exception:
+            parsed.append({})
+    return parsed
+
+
 def prepare_external_from_db() -> List[Dict]:
     """
     Загрузка внешних стартапов из БД (SQLite или PostgreSQL).
@@ -506,7 +979,6 @@ def prepare_external_from_db() -> List[Dict]:
         return []
 
     conn = sqlite3.connect(str(db_path))
-    conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
 
     try:
@@ -515,7 +987,10 @@ def prepare_external_from_db() -> List[Dict]:
             logger.info("Таблица external_startups не существует")
             return []
 
-        cursor.execute("SELECT * FROM external_startups")
+        # Только нужные колонки: SELECT * тянул бы и raw_data_json
+        existing = {r[1] for r in cursor.execute("PRAGMA table_info(external_startups)")}
+        columns = [c for c in _EXTERNAL_DB_COLUMNS if c in existing]
+        cursor.execute(f"SELECT {', '.join(columns)} FROM external_startups")
         rows = cursor.fetchall()
     except Exception as e:
         logger.warning("Ошибка при чтении external_startups: %s", e)
@@ -523,20 +998,17 @@ def prepare_external_from_db() -> List[Dict]:
     finally:
         conn.close()
 
-    startups = []
-    for row in rows:
-        row_dict = dict(row)
-        features_json = row_dict.get("features_json", "{}")
-        try:
-            features = json.loads(features_json)
-        except Exception:
-            features = {}
+    records = [dict(zip(columns, row)) for row in rows]
+    features_list = _parse_features_json([r.get("features_json", "{}") for r in records])
 
+    startups = []
+    for row_dict, features in zip(records, features_list):
+        reg_date = row_dict.get("registration_date")
         startup = {
             "inn": row_dict.get("inn", ""),
             "name": row_dict.get("name", ""),
             "full_legal_name": row_dict.get("full_legal_name", ""),
-            "year_founded": str(row_dict.get("registration_date", ""))[:4] if row_dict.get("registration_date") else "",
+            "year_founded": str(reg_date)[:4] if reg_date else "",
             "status": row_dict.get("status_egrul", ""),
             "region": row_dict.get("region", ""),
         }
@@ -19,8 +19,13 @@ from __future__ import annotations
 
 import argparse
 import datetime as dt
+import functools
 import json
+import os
+import pickle
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import joblib
@@ -31,28 +36,234 @@ from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(ROOT))
 
-from scoring.features import build_feature_matrix, get_feature_names
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+# CV folds stop after this many rounds without validation improvement;
+# the full-data refit then uses the folds' mean tree count (+10%)
+EARLY_STOPPING_ROUNDS = 25
+
+# A target whose labels (to 0.1) are this share one value -- e.g. mostly the
+# 3.0 default for startups without a label -- gets a constant model, not trees
+CONSTANT_LABEL_SHARE = 0.95
+
+
+# ---------------------------------------------------------------------------
+# Device selection
+# ---------------------------------------------------------------------------
+
+@functools.lru_cache(maxsize=1)
+def xgb_training_device() -> str:
+    """
+    "cuda" if XGBoost is built with CUDA and a GPU is actually usable, else "cpu".
+
+    Probed once by training one tree on a tiny matrix: without a visible GPU
+    a CUDA build silently falls back to CPU, which shows in the booster config.
+    """
+    import warnings
+
+    import xgboost as xgb
+
+    if not xgb.build_info().get("USE_CUDA"):
+        return "cpu"
+    try:
+        probe = xgb.DMatrix(np.zeros((2, 1), dtype=np.float32), label=[0.0, 1.0])
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            booster = xgb.train({"device": "cuda", "tree_method": "hist"}, probe,
+                                num_boost_round=1)
+        config = json.loads(booster.save_config())
+        device = config["learner"]["generic_param"]["device"]
+    except Exception:
+        return "cpu"
+    return "cuda" if device.startswith("cuda") else "cpu"
+
+
+@functools.lru_cache(maxsize=1)
+def lgbm_gpu_available() -> bool:
+    """True if this LightGBM build can train with device="gpu"."""
+    import lightgbm as lgb
+
+    try:
+        probe = lgb.Dataset(np.zeros((10, 1)), label=np.arange(10, dtype=float))
+        lgb.train({"device": "gpu", "verbose": -1, "min_data_in_leaf": 1},
+                  probe, num_boost_round=1)
+    except Exception:
+        return False
+    return True
 
 
 # ---------------------------------------------------------------------------
 # Training
 # ---------------------------------------------------------------------------
 
+def cv_splits(n_samples: int, n_folds: int = 5, random_state: int = 42) -> list[tuple]:
+    """Shuffled k-fold (train_idx, val_idx) pairs; compute once, reuse per target."""
+    kf = KFold(n_splits=n_folds, shuffle=True, random_state=random_state)
+    return list(kf.split(np.empty((n_samples, 0))))
+
+
+def _fold_scores(y_true: np.ndarray, y_pred: np.ndarray) -> tuple[float, float, float]:
+    """
+    (MAE, RMSE, R2) from one residual vector instead of three sklearn passes.
+
+    Accumulates in float64 so the rounded fold metrics match sklearn's; a
+    constant y_true scores R2 = 1.0 if predicted exactly, else 0.0, as
+    r2_score does.
+    """
+    y_true = np.asarray(y_true, dtype=np.float64)
+    diff = np.asarray(y_pred, dtype=np.float64) - y_true
+    mae = float(np.abs(diff).mean())
+    mse = float(np.dot(diff, diff)) / len(diff)
+    ss_tot = float(y_true.var())
+    if ss_tot == 0.0:
+        r2 = 1.0 if mse == 0.0 else 0.0
+    else:
+        r2 = 1.0 - mse / ss_tot
+    return mae, mse ** 0.5, r2
+
+
+def _run_cv_folds(fit_fold, y: np.ndarray, splits: list[tuple]) -> tuple[list[dict], list]:
+    """
+    Run k-fold CV with the folds trained concurrently.
+
+    Returns (per-fold metrics, fold models). `fit_fold(train_idx, val_idx,
+    n_jobs)` trains on one split and returns (predictions for `val_idx`,
+    number of trees kept by early stopping, model); `splits` comes from
+    cv_splits(). Boosters scale poorly past a handful of
+    threads on data this size, so several folds with a share of the cores
+    each finish sooner than one fold at a time on all of them. Threads
+    rather than processes: both engines release the GIL while training and
+    X is shared instead of pickled into every worker.
+    """
+    n_folds = len(splits)
+    n_cpu = os.cpu_count() or 1
+    workers = max(1, min(n_folds, n_cpu))
+    n_jobs = max(1, n_cpu // workers)
+
+    def run(split):
+        train_idx, val_idx = split
+        y_val = y[val_idx]
+        y_pred, n_trees, model = fit_fold(train_idx, val_idx, n_jobs)
+        return (*_fold_scores(y_val, y_pred), int(n_trees), model)
+
+    if workers == 1:
+        results = [run(split) for split in splits]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(run, splits))
+
+    fold_metrics = []
+    for fold_idx, (mae, rmse, r2, n_trees, _) in enumerate(results):
+        fold_metrics.append({"fold": fold_idx + 1, "mae": round(mae, 4), "rmse": round(rmse, 4), "r2": round(r2, 4),
+                             "n_trees": n_trees})
+        print(f"  Fold {fold_idx + 1}/{n_folds}:  MAE={mae:.4f}  RMSE={rmse:.4f}  R2={r2:.4f}  trees={n_trees}")
+    return fold_metrics, [r[-1] for r in results]
+
+
+def _final_n_estimators(fold_metrics: list[dict], max_trees: int) -> int:
+    """Tree count for the full-data fit: mean early-stopped fold size + 10%."""
+    mean_trees = np.mean([m["n_trees"] for m in fold_metrics])
+    return max(1, min(max_trees, int(mean_trees * 1.1)))
+
+
+class ConstantRegressor:
+    """Predicts the label mean; stands in for trees on a near-constant target."""
+
+    def __init__(self, value: float, n_features: int):
+        self.value = float(value)
+        self.feature_importances_ = np.zeros(n_features, dtype=np.float32)
+
+    def predict(self, X) -> np.ndarray:
+        return np.full(len(X), self.value, dtype=np.float32)
+
+
+def _constant_fit(X: np.ndarray, y: np.ndarray):
+    """
+    (ConstantRegressor, cv_metrics) if `y` is near-constant, else None.
+
+    The metrics are those of predicting the mean (R2 = 0); there are no
+    folds to report.
+    """
+    _, counts = np.unique(np.round(y, 1), return_counts=True)
+    if np.std(y) >= 1e-6 and counts.max() / len(y) <= CONSTANT_LABEL_SHARE:
+        return None
+
+    mean = float(np.mean(y))
+    print(f"\n  Near-constant target ({counts.max() / len(y):.0%} identical labels): "
+          f"constant model {mean:.4f}, no trees trained")
+    cv_metrics = {
+        "folds": [],
+        "avg_mae": round(float(np.mean(np.abs(y - mean))), 4),
+        "avg_rmse": round(float(np.std(y)), 4),
+        "avg_r2": 0.0,
+    }
+    return ConstantRegressor(mean, X.shape[1]), cv_metrics
+
+
+class EnsembleRegressor:
+    """
+    Averages the early-stopped CV fold models instead of refitting on all data.
+
+    Saves the full-data training pass. Offline use only: the predictor has
+    no inplace/compiled path or SHAP for it and retrain.py cannot warm-start
+    it, so save_model() never promotes it to model_latest and
+    train_multi_target keeps the single refit model by default.
+    """
+
+    def __init__(self, models: list):
+        self.models = list(models)
+
+    def predict(self, X) -> np.ndarray:
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        return np.mean([m.predict(X) for m in self.models], axis=0)
+
+    @property
+    def feature_importances_(self) -> np.ndarray:
+        # lgb.Booster fold models expose feature_importance() instead
+        return np.mean([
+            m.feature_importances_ if hasattr(m, "feature_importances_") else m.feature_importance()
+            for m in self.models
+        ], axis=0)
+
+
 def train_xgboost(
     X: np.ndarray,
     y: np.ndarray,
     n_folds: int = 5,
     random_state: int = 42,
+    splits: list[tuple] | None = None,
+    use_ensemble: bool = False,
 ) -> tuple:
     """
     Train XGBoost regressor with k-fold cross-validation.
 
+    `splits` (from cv_splits) overrides n_folds/random_state so several
+    targets can share one set of fold indices. `use_ensemble` returns the
+    fold models as an EnsembleRegressor instead of refitting on full data.
+
+    Near-constant targets (see CONSTANT_LABEL_SHARE) skip training and get
+    a ConstantRegressor.
+
     Returns:
-        model       -- fitted XGBRegressor on FULL data
+        model       -- fitted XGBRegressor on FULL data (or EnsembleRegressor)
         cv_metrics  -- dict with per-fold and average MAE / RMSE / R2
     """
     import xgboost as xgb
 
+    constant = _constant_fit(X, y)
+    if constant is not None:
+        return constant
+
+    # Both engines bin features (max_bin <= 256), so float64 buys no accuracy;
+    # float32 C-order halves the bytes moved per pass and avoids a conversion
+    # copy inside the library on every fold (no-op if X already is).
+    X = np.ascontiguousarray(X, dtype=np.float32)
+
     params = dict(
         n_estimators=300,
         max_depth=6,
@@ -63,43 +274,45 @@ def train_xgboost(
         reg_lambda=1.0,
         random_state=random_state,
         n_jobs=-1,
+        tree_method="hist",
+        max_bin=256,
+        device=xgb_training_device(),
     )
 
-    kf = KFold(n_splits=n_folds, shuffle=True, random_state=random_state)
-    fold_metrics = []
+    if splits is None:
+        splits = cv_splits(X.shape[0], n_folds, random_state)
 
     print(f"\n{'='*60}")
-    print(f"Training XGBoost  |  {n_folds}-fold CV  |  {X.shape[0]} samples, {X.shape[1]} features")
+    print(f"Training XGBoost  |  {len(splits)}-fold CV  |  {X.shape[0]} samples, {X.shape[1]} features")
     print(f"{'='*60}")
 
-    for fold_idx, (train_idx, val_idx) in enumerate(kf.split(X)):
-        X_tr, X_val = X[train_idx], X[val_idx]
-        y_tr, y_val = y[train_idx], y[val_idx]
-
-        model = xgb.XGBRegressor(**params)
+    def fit_fold(train_idx, val_idx, n_jobs):
+        X_val, y_val = X[val_idx], y[val_idx]
+        model = xgb.XGBRegressor(**dict(params, n_jobs=n_jobs),
+                                 early_stopping_rounds=EARLY_STOPPING_ROUNDS)
         model.fit(
-            X_tr, y_tr,
+            X[train_idx], y[train_idx],
             eval_set=[(X_val, y_val)],
             verbose=False,
         )
+        return model.predict(X_val), model.best_iteration + 1, model
 
-        y_pred = model.predict(X_val)
-        mae = mean_absolute_error(y_val, y_pred)
-        rmse = float(np.sqrt(mean_squared_error(y_val, y_pred)))
-        r2 = float(r2_score(y_val, y_pred))
-
-        fold_metrics.append({"fold": fold_idx + 1, "mae": round(mae, 4), "rmse": round(rmse, 4), "r2": round(r2, 4)})
-        print(f"  Fold {fold_idx + 1}/{n_folds}:  MAE={mae:.4f}  RMSE={rmse:.4f}  R2={r2:.4f}")
+    fold_metrics, fold_models = _run_cv_folds(fit_fold, y, splits)
 
     avg_mae = np.mean([m["mae"] for m in fold_metrics])
     avg_rmse = np.mean([m["rmse"] for m in fold_metrics])
     avg_r2 = np.mean([m["r2"] for m in fold_metrics])
     print(f"\n  Average:  MAE={avg_mae:.4f}  RMSE={avg_rmse:.4f}  R2={avg_r2:.4f}")
 
-    # Retrain on full data
-    print("\nRetraining on full dataset ...")
-    final_model = xgb.XGBRegressor(**params)
-    final_model.fit(X, y, verbose=False)
+    if use_ensemble:
+        print(f"\nUsing the {len(fold_models)} fold models as an ensemble")
+        final_model = EnsembleRegressor(fold_models)
+    else:
+        # Retrain on full data, as many trees as the folds needed
+        n_estimators = _final_n_estimators(fold_metrics, params["n_estimators"])
+        print(f"\nRetraining on full dataset ({n_estimators} trees) ...")
+        final_model = xgb.XGBRegressor(**dict(params, n_estimators=n_estimators))
+        final_model.fit(X, y, verbose=False)
 
     cv_metrics = {
         "folds": fold_metrics,
@@ -116,12 +329,23 @@ def train_lightgbm(
     y: np.ndarray,
     n_folds: int = 5,
     random_state: int = 42,
+    splits: list[tuple] | None = None,
+    use_ensemble: bool = False,
 ) -> tuple:
     """
     Train LightGBM regressor with k-fold cross-validation (fallback engine).
+
+    `splits`, `use_ensemble` and near-constant targets as in train_xgboost.
     """
     import lightgbm as lgb
 
+    constant = _constant_fit(X, y)
+    if constant is not None:
+        return constant
+
+    # float32 C-order, see train_xgboost
+    X = np.ascontiguousarray(X, dtype=np.float32)
+
     params = dict(
         n_estimators=300,
         max_depth=6,
@@ -134,37 +358,50 @@ def train_lightgbm(
         n_jobs=-1,
         verbose=-1,
     )
+    if lgbm_gpu_available():
+        params["device"] = "gpu"
 
-    kf = KFold(n_splits=n_folds, shuffle=True, random_state=random_state)
-    fold_metrics = []
+    if splits is None:
+        splits = cv_splits(X.shape[0], n_folds, random_state)
 
     print(f"\n{'='*60}")
-    print(f"Training LightGBM  |  {n_folds}-fold CV  |  {X.shape[0]} samples, {X.shape[1]} features")
+    print(f"Training LightGBM  |  {len(splits)}-fold CV  |  {X.shape[0]} samples, {X.shape[1]} features")
     print(f"{'='*60}")
 
-    for fold_idx, (train_idx, val_idx) in enumerate(kf.split(X)):
-        X_tr, X_val = X[train_idx], X[val_idx]
-        y_tr, y_val = y[train_idx], y[val_idx]
-
-        model = lgb.LGBMRegressor(**params)
-        model.fit(X_tr, y_tr, eval_set=[(X_val, y_val)])
-
-        y_pred = model.predict(X_val)
-        mae = mean_absolute_error(y_val, y_pred)
-        rmse = float(np.sqrt(mean_squared_error(y_val, y_pred)))
-        r2 = float(r2_score(y_val, y_pred))
+    # X is binned once; every fold trains on row subsets of the same bins
+    # instead of re-quantizing its own float copy. LightGBM accepts the
+    # sklearn-style names in `params` as aliases of its native ones.
+    full_ds = lgb.Dataset(X, label=y, params={"verbose": -1}).construct()
+    subset_lock = threading.Lock()
+    train_params = dict(params, objective="regression")
+    num_boost_round = train_params.pop("n_estimators")
+
+    def fit_fold(train_idx, val_idx, n_jobs):
+        with subset_lock:
+            train_ds = full_ds.subset(train_idx).construct()
+            val_ds = full_ds.subset(val_idx).construct()
+        booster = lgb.train(
+            dict(train_params, n_jobs=n_jobs), train_ds,
+            num_boost_round=num_boost_round, valid_sets=[val_ds],
+            callbacks=[lgb.early_stopping(EARLY_STOPPING_ROUNDS, verbose=False)],
+        )
+        return booster.predict(X[val_idx]), booster.best_iteration, booster
 
-        fold_metrics.append({"fold": fold_idx + 1, "mae": round(mae, 4), "rmse": round(rmse, 4), "r2": round(r2, 4)})
-        print(f"  Fold {fold_idx + 1}/{n_folds}:  MAE={mae:.4f}  RMSE={rmse:.4f}  R2={r2:.4f}")
+    fold_metrics, fold_models = _run_cv_folds(fit_fold, y, splits)
 
     avg_mae = np.mean([m["mae"] for m in fold_metrics])
     avg_rmse = np.mean([m["rmse"] for m in fold_metrics])
     avg_r2 = np.mean([m["r2"] for m in fold_metrics])
     print(f"\n  Average:  MAE={avg_mae:.4f}  RMSE={avg_rmse:.4f}  R2={avg_r2:.4f}")
 
-    print("\nRetraining on full dataset ...")
-    final_model = lgb.LGBMRegressor(**params)
-    final_model.fit(X, y)
+    if use_ensemble:
+        print(f"\nUsing the {len(fold_models)} fold models as an ensemble")
+        final_model = EnsembleRegressor(fold_models)
+    else:
+        n_estimators = _final_n_estimators(fold_metrics, params["n_estimators"])
+        print(f"\nRetraining on full dataset ({n_estimators} trees) ...")
+        final_model = lgb.LGBMRegressor(**dict(params, n_estimators=n_estimators))
+        final_model.fit(X, y)
 
     cv_metrics = {
         "folds": fold_metrics,
@@ -197,6 +434,27 @@ def feature_importance_report(model, feature_names: list[str], top_n: int = 15)
 # Save / versioning
 # ---------------------------------------------------------------------------
 
+def _write_json(path: Path, obj) -> None:
+    """Write metadata as indented UTF-8 JSON (orjson when available)."""
+    if HAS_ORJSON:
+        path.write_bytes(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        path.write_text(json.dumps(obj, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+def _save_native_model(model, model_path: Path) -> Path | None:
+    """Write the booster's native file next to `model_path`; None if n/a."""
+    if hasattr(model, "get_booster"):  # xgboost sklearn API
+        native_path = model_path.with_suffix(".ubj")
+        model.get_booster().save_model(str(native_path))
+    elif hasattr(model, "booster_"):  # lightgbm sklearn API
+        native_path = model_path.with_suffix(".txt")
+        model.booster_.save_model(str(native_path))
+    else:
+        return None
+    return native_path
+
+
 def save_model(
     model,
     cv_metrics: dict,
@@ -207,14 +465,24 @@ def save_model(
 ) -> str:
     """
     Save model and metadata. Returns the version string.
+
+    The compressed .joblib stays the canonical artifact (it is what gets
+    committed and deployed). Tree models are also written in their native
+    format next to it -- .ubj for XGBoost, .txt for LightGBM -- which is
+    several times smaller and loads without unpickling the sklearn wrapper.
+
+    An EnsembleRegressor is saved as model_ensemble_<version> only and never
+    replaces model_latest, which the serving predictor and retrain.py load.
     """
     model_dir.mkdir(parents=True, exist_ok=True)
     version = dt.datetime.now().strftime("%Y%m%d_%H%M%S")
+    is_ensemble = isinstance(model, EnsembleRegressor)
+    prefix = "model_ensemble" if is_ensemble else "model"
 
-    model_path = model_dir / f"model_{version}.joblib"
-    meta_path = model_dir / f"model_{version}_meta.json"
+    model_path = model_dir / f"{prefix}_{version}.joblib"
+    meta_path = model_dir / f"{prefix}_{version}_meta.json"
 
-    joblib.dump(model, model_path)
+    joblib.dump(model, model_path, compress=3, protocol=pickle.HIGHEST_PROTOCOL)
 
     meta = {
         "version": version,
@@ -225,7 +493,14 @@ def save_model(
         "cv_metrics": cv_metrics,
         "top_features": importance,
     }
-    meta_path.write_text(json.dumps(meta, indent=2, ensure_ascii=False), encoding="utf-8")
+    _write_json(meta_path, meta)
+
+    if is_ensemble:
+        print(f"\nEnsemble saved (not promoted to model_latest):")
+        print(f"  {model_path}")
+        print(f"  {meta_path}")
+        print(f"  Version: {version}")
+        return version
 
     # Symlink / copy as "latest"
     latest_model = model_dir / "model_latest.joblib"
@@ -236,6 +511,12 @@ def save_model(
     shutil.copy2(model_path, latest_model)
     shutil.copy2(meta_path, latest_meta)
 
+    # Native copies go last so they are never older than the .joblib they
+    # mirror (predictor.py ignores a stale model_latest.ubj)
+    native_path = _save_native_model(model, model_path)
+    if native_path is not None:
+        shutil.copy2(native_path, latest_model.with_suffix(native_path.suffix))
+
     print(f"\nModel saved:")
     print(f"  {model_path}")
     print(f"  {meta_path}")
@@ -248,10 +529,33 @@ def save_model(
 # Multi-target training (train separate models for each score dimension)
 # ---------------------------------------------------------------------------
 
+def load_training_data(csv_path: str | Path, use_cache: bool = True) -> tuple:
+    """
+    Feature matrix and all six label vectors for `csv_path`.
+
+    Goes through retrain.load_skolkovo_data, whose .npz cache next to the
+    CSV is keyed on the CSV, skolkovo_bfo.json and the feature/label code:
+    repeat runs skip CSV parsing, labeling and featurization. Startups
+    without a label row get 3.0; duplicate ids keep their last row.
+
+    Returns:
+        X             -- (N, D) float32 feature matrix
+        feature_names -- list of D feature names
+        ids           -- list of N startup IDs
+        targets       -- dict target_name -> (N,) float32 labels
+    """
+    from scoring.retrain import load_skolkovo_data
+
+    X, targets, ids, feature_names = load_skolkovo_data(csv_path, use_cache=use_cache)
+    return X, feature_names, ids, targets
+
+
 def train_multi_target(
     csv_path: str | Path,
     engine: str = "xgboost",
     model_dir: Path | None = None,
+    use_ensemble: bool = False,
+    use_cache: bool = True,
 ) -> dict:
     """
     Train models for all 6 scoring dimensions:
@@ -260,41 +564,27 @@ def train_multi_target(
 
     Returns dict with version and metrics for each target.
     """
-    from scoring.labeler import label_dataframe
-
     if model_dir is None:
         model_dir = ROOT / "scoring" / "models"
 
-    # Build features
-    X, feature_names, ids, y_overall = build_feature_matrix(csv_path)
-
-    # Get all target columns from labels
-    labels_df = label_dataframe(csv_path)
-    label_map = {r["id"]: r for _, r in labels_df.iterrows()}
-
-    targets = {
-        "overall": y_overall,
-    }
-
-    for target_name in ["tech_maturity", "innovation", "market_potential",
-                        "team_readiness", "financial_health"]:
-        col = f"score_{target_name}"
-        y_target = np.array([
-            float(label_map.get(sid, {}).get(col, 3.0))
-            if sid in label_map and len(label_map[sid]) > 0 else 3.0
-            for sid in ids
-        ], dtype=np.float32)
-        targets[target_name] = y_target
+    # Build features and labels (cached, see load_training_data). One X
+    # serves every target and every CV fold: folds run in threads (see
+    # _run_cv_folds), so workers read it in place rather than receiving
+    # pickled or shared-memory copies. Read-only guards that.
+    X, feature_names, ids, targets = load_training_data(csv_path, use_cache=use_cache)
+    X.flags.writeable = False
 
     results = {}
     train_fn = train_xgboost if engine == "xgboost" else train_lightgbm
+    # Same folds for every target: shuffled once, not six times
+    splits = cv_splits(X.shape[0])
 
     for target_name, y in targets.items():
         print(f"\n{'#'*60}")
         print(f"# Target: {target_name}")
         print(f"{'#'*60}")
 
-        model, cv_metrics = train_fn(X, y)
+        model, cv_metrics = train_fn(X, y, splits=splits, use_ensemble=use_ensemble)
         importance = feature_importance_report(model, feature_names)
 
         target_dir = model_dir / target_name
@@ -310,7 +600,8 @@ def train_multi_target(
         }
 
     # Save a summary
-    summary_path = model_dir / "training_summary.json"
+    # Ensembles are not promoted to model_latest, so they get their own summary
+    summary_path = model_dir / ("training_summary_ensemble.json" if use_ensemble else "training_summary.json")
     summary = {
         "engine": engine,
         "trained_at": dt.datetime.now().isoformat(),
@@ -318,7 +609,7 @@ def train_multi_target(
         "n_features": X.shape[1],
         "targets": results,
     }
-    summary_path.write_text(json.dumps(summary, indent=2, ensure_ascii=False), encoding="utf-8")
+    _write_json(summary_path, summary)
     print(f"\nTraining summary -> {summary_path}")
 
     return results
@@ -339,7 +630,8 @@ def train_and_evaluate(
     Tries LightGBM first, falls back to XGBoost if unavailable.
     The returned metrics dict contains: avg_mae, avg_rmse, avg_r2, folds.
     """
-    X, feature_names, ids, y = build_feature_matrix(csv_path)
+    X, feature_names, ids, targets = load_training_data(csv_path)
+    y = targets["overall"]
 
     # Pick engine
     if engine == "lightgbm":
@@ -430,8 +722,6 @@ def evaluate_saved_models(
     metrics, the script also prints the cross-validation R² stored in model meta
     (from 5-fold CV at training time).
     """
-    from scoring.labeler import label_dataframe
-
     print(f"\n{'='*60}")
     print("EVALUATION OF SAVED MODELS")
     print(f"{'='*60}")
@@ -443,20 +733,7 @@ def evaluate_saved_models(
     print("   For real accuracy, see 'CV R² (from training)' below.")
     print()
 
-    X, feature_names, ids, y_overall = build_feature_matrix(csv_path)
-    labels_df = label_dataframe(csv_path)
-    label_map = {r["id"]: r for _, r in labels_df.iterrows()}
-
-    targets = {"overall": y_overall}
-    for target_name in ["tech_maturity", "innovation", "market_potential",
-                        "team_readiness", "financial_health"]:
-        col = f"score_{target_name}"
-        y_target = np.array([
-            float(label_map.get(sid, {}).get(col, 3.0))
-            if sid in label_map and len(label_map[sid]) > 0 else 3.0
-            for sid in ids
-        ], dtype=np.float32)
-        targets[target_name] = y_target
+    X, feature_names, ids, targets = load_training_data(csv_path)
 
     n_samples, n_feat = X.shape
     print(f"Samples: {n_samples}, Features: {n_feat}\n")
@@ -509,6 +786,11 @@ def main():
                         help="Train only the overall score model (faster)")
     parser.add_argument("--evaluate", action="store_true",
                         help="Only evaluate saved models (R², MAE, RMSE), no training")
+    parser.add_argument("--ensemble", action="store_true",
+                        help="Keep the averaged CV fold models instead of refitting on full data "
+                             "(offline use: saved as model_ensemble_*, model_latest is left as is)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Rebuild features instead of reading the .npz cache next to the CSV")
     args = parser.parse_args()
 
     model_dir = Path(args.model_dir)
@@ -518,16 +800,20 @@ def main():
         return
 
     if args.single_target:
-        X, feature_names, ids, y = build_feature_matrix(args.csv)
+        X, feature_names, ids, targets = load_training_data(args.csv, use_cache=not args.no_cache)
+        y = targets["overall"]
         train_fn = train_xgboost if args.engine == "xgboost" else train_lightgbm
-        model, cv_metrics = train_fn(X, y)
+        model, cv_metrics = train_fn(X, y, use_ensemble=args.ensemble)
         importance = feature_importance_report(model, feature_names)
         save_model(
             model, cv_metrics, feature_names, importance,
             engine=args.engine, model_dir=model_dir / "overall",
         )
     else:
-        train_multi_target(args.csv, engine=args.engine, model_dir=model_dir)
+        train_multi_target(
+            args.csv, engine=args.engine, model_dir=model_dir,
+            use_ensemble=args.ensemble, use_cache=not args.no_cache,
+        )
 
 
 if __name__ == "__main__":
@@ -10,17 +10,37 @@ Configuration:
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
+import time
 from typing import Optional
 
 import httpx
 
+try:
+    import h2  # noqa: F401  -- httpx[http2]
+    HAS_HTTP2 = True
+except ImportError:
+    HAS_HTTP2 = False
+
 logger = logging.getLogger(__name__)
 
 BACKEND_URL = os.environ.get("BACKEND_URL", "http://localhost:8000")
 TIMEOUT = 30.0
 
+# One pooled client serves all bot handlers; bursts of small JSON requests
+# reuse keep-alive connections (or multiplex over HTTP/2 behind TLS)
+POOL_LIMITS = httpx.Limits(max_keepalive_connections=50, max_connections=100, keepalive_expiry=60)
+CONNECT_RETRIES = 2
+
+# Read-only status endpoints (/health, /admin/...) are polled by admin
+# panels; successful responses are reused for this many seconds
+STATUS_CACHE_TTL = 10.0
+
+# /score/batch accepts at most this many ids (backend MAX_BATCH_SCORE_IDS)
+BATCH_SCORE_LIMIT = 100
+
 
 class AutoScoutAPI:
     """Async HTTP client for the AutoScoutBot FastAPI backend."""
@@ -28,12 +48,22 @@ class AutoScoutAPI:
     def __init__(self, base_url: str = BACKEND_URL):
         self._base_url = base_url.rstrip("/")
         self._client: Optional[httpx.AsyncClient] = None
+        self._status_cache: dict[str, tuple[float, dict]] = {}  # path -> (fetched_at, json)
+        self._status_locks: dict[str, asyncio.Lock] = {}
 
     async def _get_client(self) -> httpx.AsyncClient:
         if self._client is None or self._client.is_closed:
+            # Pool, HTTP/2 and retries live on the transport: an AsyncClient
+            # given an explicit transport ignores its own http2/limits
+            transport = httpx.AsyncHTTPTransport(
+                http2=HAS_HTTP2,
+                limits=POOL_LIMITS,
+                retries=CONNECT_RETRIES,
+            )
             self._client = httpx.AsyncClient(
                 base_url=self._base_url,
                 timeout=TIMEOUT,
+                transport=transport,
             )
         return self._client
 
@@ -41,17 +71,42 @@ class AutoScoutAPI:
         if self._client and not self._client.is_closed:
             await self._client.aclose()
 
+    def _cached_status(self, path: str) -> Optional[dict]:
+        hit = self._status_cache.get(path)
+        if hit is not None and time.monotonic() - hit[0] < STATUS_CACHE_TTL:
+            return hit[1]
+        return None
+
+    async def _get_status(self, path: str) -> dict:
+        """
+        GET a read-only status endpoint, reusing a response younger than
+        STATUS_CACHE_TTL. Concurrent callers share one in-flight request.
+        Errors propagate and are never cached.
+        """
+        cached = self._cached_status(path)
+        if cached is not None:
+            return cached
+
+        lock = self._status_locks.setdefault(path, asyncio.Lock())
+        async with lock:
+            cached = self._cached_status(path)
+            if cached is not None:
+                return cached
+            client = await self._get_client()
+            resp = await client.get(path)
+            resp.raise_for_status()
+            data = resp.json()
+            self._status_cache[path] = (time.monotonic(), data)
+            return data
+
     # ------------------------------------------------------------------
     # Health
     # ------------------------------------------------------------------
 
     async def health(self) -> dict:
         """Check if the backend is alive."""
-        client = await self._get_client()
         try:
-            resp = await client.get("/health")
-            resp.raise_for_status()
-            return resp.json()
+            return await self._get_status("/health")
         except Exception as e:
             logger.warning("Backend health check failed: %s", e)
             return {"status": "unavailable", "error": str(e)}
@@ -123,28 +178,51 @@ class AutoScoutAPI:
             logger.error("Full score API call failed for %s: %s", startup_id, e)
             return None
 
+    async def get_full_scores(self, startup_ids: list[str]) -> list[dict]:
+        """
+        Call /score/batch: /score/full for several startups in one request.
+
+        Returns results in request order; unknown ids are omitted and any
+        error yields an empty list. Longer lists are sent as concurrent
+        requests of BATCH_SCORE_LIMIT ids each.
+        """
+        if not startup_ids:
+            return []
+        client = await self._get_client()
+        # The backend drops repeated ids per request; do it before chunking
+        ids = list(dict.fromkeys(startup_ids))
+
+        async def post_chunk(chunk: list[str]) -> list[dict]:
+            resp = await client.post("/score/batch", json={"startup_ids": chunk})
+            resp.raise_for_status()
+            return resp.json().get("results", [])
+
+        try:
+            chunks = await asyncio.gather(*[
+                post_chunk(ids[i:i + BATCH_SCORE_LIMIT])
+                for i in range(0, len(ids), BATCH_SCORE_LIMIT)
+            ])
+            return [res for chunk in chunks for res in chunk]
+        except Exception as e:
+            logger.error("Batch score API call failed for %d startups: %s", len(startup_ids), e)
+            return []
+
     # ------------------------------------------------------------------
     # Admin
     # ------------------------------------------------------------------
 
     async def get_stats(self) -> Optional[dict]:
         """Call /admin/stats endpoint."""
-        client = await self._get_client()
         try:
-            resp = await client.get("/admin/stats")
-            resp.raise_for_status()
-            return resp.json()
+            return await self._get_status("/admin/stats")
         except Exception as e:
             logger.error("Stats API call failed: %s", e)
             return None
 
     async def get_enrichment_status(self) -> Optional[dict]:
         """Call /admin/enrichment/status endpoint."""
-        client = await self._get_client()
         try:
-            resp = await client.get("/admin/enrichment/status")
-            resp.raise_for_status()
-            return resp.json()
+            return await self._get_status("/admin/enrichment/status")
         except Exception as e:
             logger.error("Enrichment status API call failed: %s", e)
             return None
@@ -155,6 +233,7 @@ class AutoScoutAPI:
         try:
             resp = await client.post(f"/admin/enrich/{startup_id}")
             resp.raise_for_status()
+            self._status_cache.pop("/admin/enrichment/status", None)
             return resp.json()
         except Exception as e:
             logger.error("Enrich API call failed for %s: %s", startup_id, e)
@@ -162,11 +241,8 @@ class AutoScoutAPI:
 
     async def get_ml_status(self) -> Optional[dict]:
         """Call /admin/ml/status endpoint."""
-        client = await self._get_client()
         try:
-            resp = await client.get("/admin/ml/status")
-            resp.raise_for_status()
-            return resp.json()
+            return await self._get_status("/admin/ml/status")
         except Exception as e:
             logger.error("ML status API call failed: %s", e)
             return None
@@ -9,13 +9,84 @@
 - Smart article search (query generation via GigaChat _internal)
 """
 import asyncio
+import json
 import logging
 import re
-from typing import Dict, List, Optional
+import threading
+from typing import Awaitable, Callable, Dict, List, Optional
 from datetime import datetime
 
+import numpy as np
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 logger = logging.getLogger(__name__)
 
+# Шаблоны для ячеек TRL/IRL/MRL/CRL (применяются к каждому стартапу)
+_REC_RE = re.compile(r'рекомендация[:\s]+(.+?)(?:\n|$)', re.IGNORECASE)
+_DASH_RE = re.compile(r'\d+\s*[-–]\s*(.+?)(?:\n|$)')
+_NUM_RE = re.compile(r'\d+')
+# Markdown-ограждения вокруг JSON в ответах GigaChat
+_FENCE_RE = re.compile(r'```(?:json)?')
+
+# Оценки для пакетного анализа (analyze_startup_deep_batch), по возрастанию
+# кода -- те же пороги и формулировки, что в _assess_* ниже
+_LEVEL_THRESHOLDS = np.array([3, 5, 7])
+_READINESS_LABELS = np.array([
+    "очень ранняя стадия, концепция",
+    "низкая готовность, ранняя стадия",
+    "средняя готовность, требуется доработка",
+    "высокая готовность к коммерциализации",
+], dtype=object)
+_TEAM_LABELS = np.array([
+    "команда формируется",
+    "базовая готовность команды",
+    "средняя готовность команды",
+    "высокая готовность команды",
+], dtype=object)
+_FINANCIAL_HEALTH_LABELS = np.array([
+    "критическое", "слабое", "умеренное", "отличное (растущее)", "стабильное",
+], dtype=object)
+
+
+# Фоновый event loop для синхронной обёртки _analyze_external_sources:
+# один loop (и один ParserManager с его пулами) на все синхронные вызовы
+_BG_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_BG_LOOP_LOCK = threading.Lock()
+
+
+def _get_bg_loop() -> asyncio.AbstractEventLoop:
+    global _BG_LOOP
+    with _BG_LOOP_LOCK:
+        if _BG_LOOP is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="deep-analysis-loop", daemon=True).start()
+            _BG_LOOP = loop
+        return _BG_LOOP
+
+
+def _assess_batch(levels: np.ndarray, avg_profit: np.ndarray, max_profit: np.ndarray):
+    """
+    Пороговые оценки сразу для N стартапов.
+
+    levels -- (N, 4) TRL/IRL/MRL/CRL. Возвращает (average_level, readiness,
+    team_readiness, financial_health): массив средних и списки строк.
+    """
+    total = levels.sum(axis=1)
+    average = np.where(total > 0, total / 4, 0.0)
+    readiness = _READINESS_LABELS[np.searchsorted(_LEVEL_THRESHOLDS, average, side="right")]
+    team = _TEAM_LABELS[np.searchsorted(_LEVEL_THRESHOLDS, levels[:, 3], side="right")]
+    financial = _FINANCIAL_HEALTH_LABELS[np.select(
+        [avg_profit <= 0, avg_profit < 1_000_000, avg_profit < 10_000_000, max_profit > avg_profit * 1.5],
+        [0, 1, 2, 3],
+        default=4,
+    )]
+    return average, readiness.tolist(), team.tolist(), financial.tolist()
+
 
 class DeepAnalysisService:
     """
@@ -24,6 +95,35 @@ class DeepAnalysisService:
     
     def __init__(self):
         self.external_sources_enabled = True  # Enabled: uses parsers from parsers/
+        # ParserManager держит HTTP-клиенты парсеров -- создаём один раз и
+        # переиспользуем пулы соединений между анализами (закрывается в close())
+        self._mgr = None
+        self._mgr_loop = None
+        self._mgr_lock = asyncio.Lock()
+
+    async def _get_mgr(self):
+        """Ленивый ParserManager, общий для всех вызовов в текущем event loop."""
+        loop = asyncio.get_running_loop()
+        if self._mgr is not None and self._mgr_loop is loop:
+            return self._mgr
+        async with self._mgr_lock:
+            # Клиенты httpx привязаны к loop, в котором созданы
+            if self._mgr is None or self._mgr_loop is not loop:
+                from parsers.manager import ParserManager
+                self._mgr = ParserManager()
+                self._mgr_loop = loop
+            return self._mgr
+
+    async def close(self):
+        """Закрыть HTTP-клиенты внешних парсеров (при остановке бота)."""
+        mgr, loop, self._mgr, self._mgr_loop = self._mgr, self._mgr_loop, None, None
+        if mgr is None:
+            return
+        if loop is asyncio.get_running_loop():
+            await mgr.close()
+        elif loop.is_running():
+            # Менеджер создан фоновым loop синхронной обёртки -- закрываем там же
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(mgr.close(), loop))
     
     def analyze_startup_deep(
         self,
@@ -48,12 +148,57 @@ class DeepAnalysisService:
                 startup.get("ogrn", ""),
             )
 
-        analysis["recommendations"] = self._generate_recommendations(analysis)
-        analysis["risk_factors"] = self._identify_risks(analysis)
-        analysis["opportunities"] = self._identify_opportunities(analysis, user_request)
+        (
+            analysis["recommendations"],
+            analysis["risk_factors"],
+            analysis["opportunities"],
+        ) = self._derive_insights(analysis, user_request)
 
         return analysis
 
+    def analyze_startup_deep_batch(self, startups: List[Dict], user_request: str = "") -> List[Dict]:
+        """
+        analyze_startup_deep() без внешних источников для списка стартапов.
+
+        Уровни и прибыль собираются в массивы один раз, пороговые оценки
+        (готовность, команда, финансы) считаются по ним сразу для всех.
+        """
+        if not startups:
+            return []
+
+        level_rows = [
+            [self._extract_level_value(st.get(key, 0)) for key in ("trl", "irl", "mrl", "crl")]
+            for st in startups
+        ]
+        avg_profits = [st.get("avg_profit", 0) for st in startups]
+        max_profits = [st.get("max_profit", 0) for st in startups]
+        average, readiness, team, financial = _assess_batch(
+            np.array(level_rows, dtype=np.float64),
+            np.array(avg_profits, dtype=np.float64),
+            np.array(max_profits, dtype=np.float64),
+        )
+
+        analyses = []
+        for i, startup in enumerate(startups):
+            trl, irl, mrl, crl = level_rows[i]
+            analysis = self._build_base_analysis(startup)
+            analysis["internal_analysis"] = self._internal_analysis(
+                startup, avg_profits[i], max_profits[i], financial[i],
+                trl, irl, mrl, crl,
+                float(average[i]) if trl + irl + mrl + crl > 0 else 0,
+                readiness[i], team[i],
+            )
+            analysis["internal_analysis"]["level_recommendations"] = self._extract_level_recommendations(startup)
+
+            (
+                analysis["recommendations"],
+                analysis["risk_factors"],
+                analysis["opportunities"],
+            ) = self._derive_insights(analysis, user_request)
+            analyses.append(analysis)
+
+        return analyses
+
     async def analyze_startup_deep_async(
         self,
         startup: Dict,
@@ -74,23 +219,34 @@ class DeepAnalysisService:
 
         # 2. External sources + smart article search (in parallel)
         if include_external and self.external_sources_enabled and inn:
-            ext_task = self.analyze_external_sources(
+            ext_task = asyncio.ensure_future(self.analyze_external_sources(
                 inn=inn,
                 ogrn=str(startup.get("ogrn", "")),
                 company_name=company_name,
-            )
+            ))
+
+            async def ext_news() -> List[Dict]:
+                # Новости по company_name уже собирает ParserManager
+                return (await asyncio.shield(ext_task)).get("news_mentions", [])
+
+            # Срез описания технологий делаем один раз (поле бывает в несколько КБ или None)
+            tech_ctx = (startup.get("technologies") or "")[:200]
+            cluster = startup.get("cluster") or ""
             articles_task = self.smart_article_search(
                 company_name=company_name,
-                context=f"{startup.get('cluster', '')} {startup.get('technologies', '')[:200]}",
+                context=f"{cluster} {tech_ctx}",
+                prefetched_news=ext_news,
             )
             ext_result, articles = await asyncio.gather(ext_task, articles_task)
             analysis["external_analysis"] = ext_result
             analysis["smart_articles"] = articles
 
         # 3. Recommendations, risks, opportunities
-        analysis["recommendations"] = self._generate_recommendations(analysis)
-        analysis["risk_factors"] = self._identify_risks(analysis)
-        analysis["opportunities"] = self._identify_opportunities(analysis, user_request)
+        (
+            analysis["recommendations"],
+            analysis["risk_factors"],
+            analysis["opportunities"],
+        ) = self._derive_insights(analysis, user_request)
 
         return analysis
 
@@ -111,6 +267,42 @@ class DeepAnalysisService:
     
     def _analyze_internal_data(self, startup: Dict) -> Dict:
         """Анализ внутренних данных из БД Сколково"""
+        # Финансовый анализ
+        avg_profit = startup.get("avg_profit", 0)
+        max_profit = startup.get("max_profit", 0)
+        
+        # Технологический анализ
+        trl = self._extract_level_value(startup.get("trl", 0))
+        irl = self._extract_level_value(startup.get("irl", 0))
+        mrl = self._extract_level_value(startup.get("mrl", 0))
+        crl = self._extract_level_value(startup.get("crl", 0))
+        
+        total = trl + irl + mrl + crl
+        average_level = total * 0.25 if total > 0 else 0
+        
+        return self._internal_analysis(
+            startup, avg_profit, max_profit, self._assess_financial_health(avg_profit, max_profit),
+            trl, irl, mrl, crl,
+            average_level,
+            self._assess_readiness_from_avg(average_level),
+            self._assess_team_readiness(crl),
+        )
+    
+    def _internal_analysis(
+        self,
+        startup: Dict,
+        avg_profit,
+        max_profit,
+        financial_health: str,
+        trl: int,
+        irl: int,
+        mrl: int,
+        crl: int,
+        average_level: float,
+        readiness_assessment: str,
+        team_readiness: str,
+    ) -> Dict:
+        """Словарь internal_analysis из уже посчитанных уровней и оценок"""
         internal = {
             "financial_analysis": {},
             "technology_analysis": {},
@@ -118,30 +310,20 @@ class DeepAnalysisService:
             "team_analysis": {},
         }
         
-        # Финансовый анализ
-        avg_profit = startup.get("avg_profit", 0)
-        max_profit = startup.get("max_profit", 0)
-        
         internal["financial_analysis"] = {
             "avg_profit": avg_profit,
             "max_profit": max_profit,
             "growth_trend": "растущий" if max_profit > avg_profit else "стабильный",
-            "financial_health": self._assess_financial_health(avg_profit, max_profit),
+            "financial_health": financial_health,
         }
         
-        # Технологический анализ
-        trl = self._extract_level_value(startup.get("trl", 0))
-        irl = self._extract_level_value(startup.get("irl", 0))
-        mrl = self._extract_level_value(startup.get("mrl", 0))
-        crl = self._extract_level_value(startup.get("crl", 0))
-        
         internal["technology_analysis"] = {
             "trl": trl,
             "irl": irl,
             "mrl": mrl,
             "crl": crl,
-            "average_level": (trl + irl + mrl + crl) / 4 if (trl + irl + mrl + crl) > 0 else 0,
-            "readiness_assessment": self._assess_readiness(trl, irl, mrl, crl),
+            "average_level": average_level,
+            "readiness_assessment": readiness_assessment,
         }
         
         # Анализ рынка
@@ -159,7 +341,7 @@ class DeepAnalysisService:
         # Анализ команды
         internal["team_analysis"] = {
             "crl": crl,
-            "team_readiness": self._assess_team_readiness(crl),
+            "team_readiness": team_readiness,
         }
         
         return internal
@@ -184,12 +366,12 @@ class DeepAnalysisService:
             
             if isinstance(value, str):
                 # Ищем паттерны типа "5 (рекомендация: ...)" или просто текст
-                match = re.search(r'рекомендация[:\s]+(.+?)(?:\n|$)', value, re.IGNORECASE)
+                match = _REC_RE.search(value)
                 if match:
                     recommendations[level].append(match.group(1).strip())
                 
                 # Ищем паттерны типа "5 - описание"
-                match = re.search(r'\d+\s*[-–]\s*(.+?)(?:\n|$)', value)
+                match = _DASH_RE.search(value)
                 if match:
                     recommendations[level].append(match.group(1).strip())
         
@@ -226,12 +408,10 @@ class DeepAnalysisService:
             return external
 
         try:
-            from parsers.manager import ParserManager
             from scoring.bfo_ratios import compute_ratios_for_year, compute_dynamic_ratios
 
-            mgr = ParserManager()
+            mgr = await self._get_mgr()
             raw = await mgr.fetch_all(inn=inn, company_name=company_name)
-            await mgr.close()
 
             # BFO -- financial data
             bfo = raw.get("bfo", {})
@@ -303,18 +483,14 @@ class DeepAnalysisService:
 
     # Keep old sync method name for backward compat (wraps async)
     def _analyze_external_sources(self, inn: str, ogrn: str) -> Dict:
-        """Sync wrapper around async analyze_external_sources."""
+        """Sync wrapper around async analyze_external_sources (runs on the background loop)."""
+        future = asyncio.run_coroutine_threadsafe(
+            self.analyze_external_sources(inn, ogrn), _get_bg_loop()
+        )
         try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                import concurrent.futures
-                with concurrent.futures.ThreadPoolExecutor() as pool:
-                    return pool.submit(
-                        asyncio.run,
-                        self.analyze_external_sources(inn, ogrn)
-                    ).result(timeout=60)
-            return asyncio.run(self.analyze_external_sources(inn, ogrn))
+            return future.result(timeout=60)
         except Exception as e:
+            future.cancel()
             logger.warning(f"Sync external analysis failed: {e}")
             return {"financial_data": {}, "news_mentions": [], "reliability_score": 0.0, "sources": []}
     
@@ -333,8 +509,11 @@ class DeepAnalysisService:
     
     def _assess_readiness(self, trl: int, irl: int, mrl: int, crl: int) -> str:
         """Оценка общей готовности проекта"""
-        avg = (trl + irl + mrl + crl) / 4 if (trl + irl + mrl + crl) > 0 else 0
-        
+        total = trl + irl + mrl + crl
+        return self._assess_readiness_from_avg(total * 0.25 if total > 0 else 0)
+    
+    def _assess_readiness_from_avg(self, avg: float) -> str:
+        """Оценка общей готовности по уже посчитанному среднему уровню"""
         if avg >= 7:
             return "высокая готовность к коммерциализации"
         elif avg >= 5:
@@ -364,13 +543,25 @@ class DeepAnalysisService:
         else:
             return "команда формируется"
     
-    def _generate_recommendations(self, analysis: Dict) -> List[str]:
-        """Генерация рекомендаций на основе анализа"""
-        recommendations = []
-        
+    def _derive_insights(self, analysis: Dict, user_request: str):
+        """
+        Рекомендации, риски и возможности за один разбор internal_analysis.
+
+        Returns:
+            (recommendations, risk_factors, opportunities)
+        """
         internal = analysis.get("internal_analysis", {})
         tech = internal.get("technology_analysis", {})
         finance = internal.get("financial_analysis", {})
+        return (
+            self._generate_recommendations(internal, tech, finance),
+            self._identify_risks(analysis, internal, tech, finance),
+            self._identify_opportunities(tech, user_request),
+        )
+
+    def _generate_recommendations(self, internal: Dict, tech: Dict, finance: Dict) -> List[str]:
+        """Генерация рекомендаций на основе анализа"""
+        recommendations = []
         
         # Рекомендации по технологиям
         avg_level = tech.get("average_level", 0)
@@ -396,7 +587,7 @@ class DeepAnalysisService:
         
         return recommendations
     
-    def _identify_risks(self, analysis: Dict) -> List[str]:
+    def _identify_risks(self, analysis: Dict, internal: Dict, tech: Dict, finance: Dict) -> List[str]:
         """Выявление рисков (технологических, финансовых, рыночных, командных) с учётом динамики.
 
         Одновременно формирует структурированную карту рисков analysis['risk_map'].
@@ -417,9 +608,6 @@ class DeepAnalysisService:
                 }
             )
 
-        internal = analysis.get("internal_analysis", {})
-        tech = internal.get("technology_analysis", {})
-        finance = internal.get("financial_analysis", {})
         external = analysis.get("external_analysis", {})
         fin_ratios = external.get("financial_ratios", {})
         static = fin_ratios.get("static", {}) if isinstance(fin_ratios, dict) else {}
@@ -622,13 +810,10 @@ class DeepAnalysisService:
         analysis["risk_map"] = risk_map
         return risks
     
-    def _identify_opportunities(self, analysis: Dict, user_request: str) -> List[str]:
+    def _identify_opportunities(self, tech: Dict, user_request: str) -> List[str]:
         """Выявление возможностей"""
         opportunities = []
         
-        internal = analysis.get("internal_analysis", {})
-        tech = internal.get("technology_analysis", {})
-        
         # Возможности по технологиям
         if tech.get("trl", 0) >= 7:
             opportunities.append("Высокая технологическая зрелость - готовность к масштабированию")
@@ -650,18 +835,35 @@ class DeepAnalysisService:
         if isinstance(value, int):
             return value
         elif isinstance(value, str):
-            # Ищем первое число в строке
-            match = re.search(r'\d+', value)
+            # Обычно ячейка начинается с числа ("4.0", "5 - описание"):
+            # короткий проход по цифрам дешевле запуска regex
+            if value[:1].isdecimal():
+                end, n = 1, len(value)
+                while end < n and value[end].isdecimal():
+                    end += 1
+                return int(value[:end])
+            # Иначе ищем первое число в строке
+            match = _NUM_RE.search(value)
             if match:
                 return int(match.group())
         return 0
     
-    async def smart_article_search(self, company_name: str, context: str = "") -> List[Dict]:
+    async def smart_article_search(
+        self,
+        company_name: str,
+        context: str = "",
+        prefetched_news: Optional[Callable[[], Awaitable[List[Dict]]]] = None,
+    ) -> List[Dict]:
         """
         Use GigaChat (_internal tier) to generate smart search queries,
         then search RSS feeds for relevant articles.
 
         GigaChat тратит остаточные токены -- не NeuroAPI.
+
+        Args:
+            prefetched_news: async callable returning RSS mentions already
+                fetched for company_name (external analysis). Used instead of
+                a repeated RSS request when the only query is company_name.
         """
         articles: List[Dict] = []
 
@@ -687,37 +889,51 @@ class DeepAnalysisService:
                 "Ответь JSON-массивом строк, без markdown."
             )
 
-            resp = giga.chat(Chat(
+            # giga.chat() синхронный -- в отдельном потоке, чтобы не блокировать
+            # event loop (параллельно идёт analyze_external_sources)
+            resp = await asyncio.to_thread(giga.chat, Chat(
                 messages=[Messages(role=MessagesRole.USER, content=prompt)],
                 max_tokens=200,
                 temperature=0.3,
             ))
 
             queries_text = resp.choices[0].message.content.strip() if resp.choices else "[]"
-            queries_text = queries_text.replace("```json", "").replace("```", "").strip()
+            queries_text = _FENCE_RE.sub("", queries_text).strip()
 
-            import json
             try:
-                queries = json.loads(queries_text)
+                # orjson.JSONDecodeError -- подкласс json.JSONDecodeError
+                queries = orjson.loads(queries_text) if HAS_ORJSON else json.loads(queries_text)
             except json.JSONDecodeError:
                 queries = [company_name]
 
-            from parsers.news_parser import NewsParser
-            parser = NewsParser()
-            for query in queries[:3]:
-                result = await parser.safe_fetch(inn="", company_name=str(query))
-                for mention in result.get("mentions", []):
-                    articles.append(mention)
-            await parser.close()
-
-            seen_links = set()
-            unique = []
+            if prefetched_news is not None and queries == [company_name]:
+                # GigaChat не дал своих запросов -- тот же поиск по названию
+                # уже выполнен во внешнем анализе, повторно RSS не запрашиваем
+                articles.extend(await prefetched_news())
+            else:
+                from parsers.news_parser import NewsParser
+                parser = NewsParser()
+                # Запросы к RSS независимы -- выполняем параллельно
+                results = await asyncio.gather(
+                    *[parser.safe_fetch(inn="", company_name=str(query)) for query in queries[:3]],
+                    return_exceptions=True,
+                )
+                await parser.close()
+                for result in results:
+                    if isinstance(result, Exception):
+                        logger.warning("smart_article_search: RSS fetch failed: %s", result)
+                        continue
+                    articles.extend(result.get("mentions", []))
+
+            # Дедупликация по ссылке: первая статья для каждой ссылки, порядок сохраняется
+            unique: Dict[str, Dict] = {}
             for art in articles:
-                link = art.get("link", "")
-                if link and link not in seen_links:
-                    seen_links.add(link)
-                    unique.append(art)
-            articles = unique[:10]
+                link = art.get("link")
+                if link:
+                    unique.setdefault(link, art)
+                    if len(unique) == 10:
+                        break
+            articles = list(unique.values())
 
             if articles:
                 titles = "\n".join(f"- {a['title']}" for a in articles[:5])
@@ -726,7 +942,7 @@ class DeepAnalysisService:
                     f"на основе заголовков:\n{titles}\n\n"
                     "Ответь 2-3 предложениями на русском."
                 )
-                summary_resp = giga.chat(Chat(
+                summary_resp = await asyncio.to_thread(giga.chat, Chat(
                     messages=[Messages(role=MessagesRole.USER, content=summary_prompt)],
                     max_tokens=200,
                     temperature=0.4,
@@ -754,111 +970,125 @@ class DeepAnalysisService:
         Returns:
             Отформатированный текст отчета
         """
-        report = f"🔬 <b>ГЛУБОКИЙ АНАЛИЗ: {analysis['startup_name']}</b>\n"
-        report += "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n\n"
+        parts = [f"🔬 <b>ГЛУБОКИЙ АНАЛИЗ: {analysis['startup_name']}</b>\n"]
+        parts.append("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n\n")
         
         # Внутренний анализ
         internal = analysis.get("internal_analysis", {})
         
         # Технологии
         tech = internal.get("technology_analysis", {})
-        report += f"<b>🔬 Технологическая зрелость:</b>\n"
-        report += f"• TRL: {tech.get('trl', 0)}/9\n"
-        report += f"• IRL: {tech.get('irl', 0)}/9\n"
-        report += f"• MRL: {tech.get('mrl', 0)}/9\n"
-        report += f"• CRL: {tech.get('crl', 0)}/9\n"
-        report += f"• Средний уровень: {tech.get('average_level', 0):.1f}\n"
-        report += f"• Оценка: {tech.get('readiness_assessment', 'н/д')}\n\n"
+        parts.append(f"<b>🔬 Технологическая зрелость:</b>\n")
+        parts.append(f"• TRL: {tech.get('trl', 0)}/9\n")
+        parts.append(f"• IRL: {tech.get('irl', 0)}/9\n")
+        parts.append(f"• MRL: {tech.get('mrl', 0)}/9\n")
+        parts.append(f"• CRL: {tech.get('crl', 0)}/9\n")
+        parts.append(f"• Средний уровень: {tech.get('average_level', 0):.1f}\n")
+        parts.append(f"• Оценка: {tech.get('readiness_assessment', 'н/д')}\n\n")
         
         # Финансы
         finance = internal.get("financial_analysis", {})
-        report += f"<b>💰 Финансовый анализ:</b>\n"
-        report += f"• Средняя прибыль: {finance.get('avg_profit', 0) / 1_000_000:.2f} млн руб\n"
-        report += f"• Максимальная прибыль: {finance.get('max_profit', 0) / 1_000_000:.2f} млн руб\n"
-        report += f"• Тренд: {finance.get('growth_trend', 'н/д')}\n"
-        report += f"• Оценка: {finance.get('financial_health', 'н/д')}\n\n"
+        parts.append(f"<b>💰 Финансовый анализ:</b>\n")
+        parts.append(f"• Средняя прибыль: {finance.get('avg_profit', 0) / 1_000_000:.2f} млн руб\n")
+        parts.append(f"• Максимальная прибыль: {finance.get('max_profit', 0) / 1_000_000:.2f} млн руб\n")
+        parts.append(f"• Тренд: {finance.get('growth_trend', 'н/д')}\n")
+        parts.append(f"• Оценка: {finance.get('financial_health', 'н/д')}\n\n")
         
         # Рекомендации
         recommendations = analysis.get("recommendations", [])
         if recommendations:
-            report += f"<b>💡 Рекомендации:</b>\n"
-            for i, rec in enumerate(recommendations[:5], 1):  # Максимум 5
-                report += f"{i}. {rec}\n"
-            report += "\n"
+            parts.append(f"<b>💡 Рекомендации:</b>\n")
+            parts.append("".join(f"{i}. {rec}\n" for i, rec in enumerate(recommendations[:5], 1)))  # Максимум 5
+            parts.append("\n")
         
         # Риски
         risks = analysis.get("risk_factors", [])
         if risks:
-            report += f"<b>⚠️ Риски:</b>\n"
-            for i, risk in enumerate(risks[:5], 1):  # Максимум 5
-                report += f"{i}. {risk}\n"
-            report += "\n"
+            parts.append(f"<b>⚠️ Риски:</b>\n")
+            parts.append("".join(f"{i}. {risk}\n" for i, risk in enumerate(risks[:5], 1)))  # Максимум 5
+            parts.append("\n")
         
         # Возможности
         opportunities = analysis.get("opportunities", [])
         if opportunities:
-            report += f"<b>🚀 Возможности:</b>\n"
-            for i, opp in enumerate(opportunities[:5], 1):  # Максимум 5
-                report += f"{i}. {opp}\n"
-            report += "\n"
+            parts.append(f"<b>🚀 Возможности:</b>\n")
+            parts.append("".join(f"{i}. {opp}\n" for i, opp in enumerate(opportunities[:5], 1)))  # Максимум 5
+            parts.append("\n")
         
         # External sources
         external = analysis.get("external_analysis", {})
         sources = external.get("sources", [])
         if sources:
-            report += "<b>🌐 Внешние источники:</b>\n"
-            for src in sources:
-                report += f"  • {src.get('name', src.get('key', ''))}\n"
-            report += f"  Достоверность данных: {external.get('reliability_score', 0):.0%}\n\n"
+            parts.append("<b>🌐 Внешние источники:</b>\n")
+            parts.append("".join(f"  • {src.get('name', src.get('key', ''))}\n" for src in sources))
+            parts.append(f"  Достоверность данных: {external.get('reliability_score', 0):.0%}\n\n")
 
         # Financial data from external
         fin = external.get("financial_data", {})
         if fin:
-            report += "<b>💰 Финансы (внешние источники):</b>\n"
-            for year in sorted(fin.keys(), reverse=True)[:3]:
-                yd = fin[year] if isinstance(fin[year], dict) else {}
-                rev = yd.get("revenue", 0)
-                profit = yd.get("net_profit", 0)
-                rev_s = f"{rev / 1_000_000:.1f} млн" if rev else "н/д"
-                prof_s = f"{profit / 1_000_000:.1f} млн" if profit else "н/д"
-                report += f"  • {year}: выручка {rev_s}, прибыль {prof_s}\n"
-            report += "\n"
+            parts.append("<b>💰 Финансы (внешние источники):</b>\n")
+            parts.append("".join(
+                self._format_year_line(year, fin[year]) for year in sorted(fin.keys(), reverse=True)[:3]
+            ))
+            parts.append("\n")
 
         # Legal status from EGRUL
         legal = external.get("legal_status", {})
         if legal:
-            report += "<b>📋 Юридический статус (ЕГРЮЛ):</b>\n"
+            parts.append("<b>📋 Юридический статус (ЕГРЮЛ):</b>\n")
             if legal.get("status"):
-                report += f"  • Статус: {legal['status']}\n"
+                parts.append(f"  • Статус: {legal['status']}\n")
             if legal.get("registration_date"):
-                report += f"  • Дата рег.: {legal['registration_date']}\n"
-            report += "\n"
+                parts.append(f"  • Дата рег.: {legal['registration_date']}\n")
+            parts.append("\n")
 
         # News mentions
         news = external.get("news_mentions", [])
         if news:
-            report += f"<b>📰 Упоминания в СМИ ({len(news)}):</b>\n"
-            for mention in news[:5]:
-                if mention.get("summary"):
-                    report += f"  {mention['summary']}\n"
-                else:
-                    src = mention.get("source", "").upper()
-                    title = mention.get("title", "")[:80]
-                    report += f"  • [{src}] {title}\n"
-            report += "\n"
+            parts.append(f"<b>📰 Упоминания в СМИ ({len(news)}):</b>\n")
+            parts.append("".join(
+                f"  {mention['summary']}\n" if mention.get("summary")
+                else f"  • [{mention.get('source', '').upper()}] {mention.get('title', '')[:80]}\n"
+                for mention in news[:5]
+            ))
+            parts.append("\n")
 
         # Smart article search results
         smart_articles = analysis.get("smart_articles", [])
         if smart_articles:
-            report += "<b>🔎 Найденные статьи (AI-поиск):</b>\n"
-            for art in smart_articles[:5]:
-                if art.get("summary"):
-                    report += f"  📝 {art['summary']}\n"
-                else:
-                    report += f"  • [{art.get('source', '').upper()}] {art.get('title', '')[:80]}\n"
-            report += "\n"
+            parts.append("<b>🔎 Найденные статьи (AI-поиск):</b>\n")
+            parts.append("".join(
+                f"  📝 {art['summary']}\n" if art.get("summary")
+                else f"  • [{art.get('source', '').upper()}] {art.get('title', '')[:80]}\n"
+                for art in smart_articles[:5]
+            ))
+            parts.append("\n")
+
+        parts.append("<i>Полный отчет доступен в файле Excel/CSV</i>")
+
+        return "".join(parts)
+
+    @staticmethod
+    def _format_year_line(year, year_data) -> str:
+        """Строка отчёта с выручкой и прибылью за год (внешние источники)"""
+        yd = year_data if isinstance(year_data, dict) else {}
+        rev = yd.get("revenue", 0)
+        profit = yd.get("net_profit", 0)
+        rev_s = f"{rev / 1_000_000:.1f} млн" if rev else "н/д"
+        prof_s = f"{profit / 1_000_000:.1f} млн" if profit else "н/д"
+        return f"  • {year}: выручка {rev_s}, прибыль {prof_s}\n"
+
+
+# ---------------------------------------------------------------------------
+# Module-level singleton
+# ---------------------------------------------------------------------------
 
-        report += "<i>Полный отчет доступен в файле Excel/CSV</i>"
+_deep_analysis_service: Optional[DeepAnalysisService] = None
 
-        return report
 
+def get_deep_analysis_service() -> DeepAnalysisService:
+    """Get or create the global DeepAnalysisService (shares parser HTTP pools)."""
+    global _deep_analysis_service
+    if _deep_analysis_service is None:
+        _deep_analysis_service = DeepAnalysisService()
+    return _deep_analysis_service